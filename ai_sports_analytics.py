@@ -1,14 +1,56 @@
+import hashlib
+import importlib
+import json
+import math
+import os
+import shutil
+import tempfile
+from fractions import Fraction
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_squared_error
-from sklearn.preprocessing import StandardScaler
-import matplotlib.pyplot as plt
-import seaborn as sns
-import joblib
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import GridSearchCV
+
+# Stand-in for a module or one of its attributes that is imported on first use
+class LazyImport:
+    def __init__(self, module, name=None, after=None):
+        self._module = module
+        self._name = name
+        self._after = after
+        self._target = None
+
+    def _load(self):
+        if self._target is None:
+            if self._after:
+                importlib.import_module(self._after)
+            target = importlib.import_module(self._module)
+            self._target = getattr(target, self._name) if self._name else target
+        return self._target
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<lazy {self._module}{'.' + self._name if self._name else ''}>"
+
+# scikit-learn (and scipy behind it) and joblib only load once a training, selection or I/O function needs them
+joblib = LazyImport('joblib')
+train_test_split = LazyImport('sklearn.model_selection', 'train_test_split')
+LinearRegression = LazyImport('sklearn.linear_model', 'LinearRegression')
+mean_squared_error = LazyImport('sklearn.metrics', 'mean_squared_error')
+StandardScaler = LazyImport('sklearn.preprocessing', 'StandardScaler')
+RandomForestRegressor = LazyImport('sklearn.ensemble', 'RandomForestRegressor')
+GridSearchCV = LazyImport('sklearn.model_selection', 'GridSearchCV')
+RandomizedSearchCV = LazyImport('sklearn.model_selection', 'RandomizedSearchCV')
+HalvingGridSearchCV = LazyImport('sklearn.model_selection', 'HalvingGridSearchCV',
+                                 after='sklearn.experimental.enable_halving_search_cv')
+HalvingRandomSearchCV = LazyImport('sklearn.model_selection', 'HalvingRandomSearchCV',
+                                   after='sklearn.experimental.enable_halving_search_cv')
+Pipeline = LazyImport('sklearn.pipeline', 'Pipeline')
+clone = LazyImport('sklearn.base', 'clone')
+Tree = LazyImport('sklearn.tree._tree', 'Tree')
+permutation_importance = LazyImport('sklearn.inspection', 'permutation_importance')
 
 # Load the dataset
 def load_data(file_path):
@@ -20,16 +62,224 @@ def load_data(file_path):
         print(f"Error loading data: {e}")
         return None
 
+# Floats whose exact sum equals that of terms: peel off the correctly rounded sum until nothing
+# is left, which takes two or three passes
+def _exact_partials(terms):
+    partials = []
+    while True:
+        partial = math.fsum(terms)
+        if partial == 0:
+            return partials
+        partials.append(partial)
+        terms.append(-partial)
+
+# Exact sum of a float array, as a Fraction so partial sums can be combined across chunks.
+# Works through the array a block at a time so only one block is ever held as Python floats.
+def exact_sum(values, block_size=1 << 16):
+    if not np.isfinite(values).all():
+        return float(values.sum())
+    partials = []
+    for start in range(0, len(values), block_size):
+        partials.extend(_exact_partials(values[start:start + block_size].tolist()))
+    return sum((Fraction(partial) for partial in _exact_partials(partials)), Fraction(0))
+
+# Column means, computed the same way in memory and chunk by chunk so both fill identical values
+def column_means(data):
+    means = {}
+    for column in data.select_dtypes(include='number').columns:
+        values = data[column].dropna().to_numpy(dtype=np.float64)
+        means[column] = float(exact_sum(values) / len(values)) if len(values) else np.nan
+    return pd.Series(means, dtype=np.float64)
+
 # Preprocessing
 def preprocess_data(data):
     # Fill missing values
-    data.fillna(data.mean(), inplace=True)
+    data.fillna(column_means(data), inplace=True)
     
     # Convert categorical variables to dummy variables
     data = pd.get_dummies(data, drop_first=True)
     
     return data
 
+# First pass over the CSV: column dtypes, sums and counts for the means, and category vocabularies
+def scan_csv(file_path, chunksize=100000):
+    stats = {}
+    for chunk in pd.read_csv(file_path, chunksize=chunksize):
+        for column in chunk.columns:
+            entry = stats.setdefault(column, {'dtypes': set(), 'sum': Fraction(0), 'count': 0,
+                                              'min': None, 'max': None, 'vocab': {}})
+            series = chunk[column]
+            entry['dtypes'].add(series.dtype)
+            if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+                values = series.dropna().to_numpy(dtype=np.float64)
+                if len(values):
+                    entry['sum'] += exact_sum(values)
+                    entry['count'] += len(values)
+                    entry['min'] = values.min() if entry['min'] is None else min(entry['min'], values.min())
+                    entry['max'] = values.max() if entry['max'] is None else max(entry['max'], values.max())
+            else:
+                for value in series.dropna().unique():
+                    entry['vocab'].setdefault(value, None)
+
+    plan = {'columns': list(stats), 'dtypes': {}, 'means': {}, 'vocab': {}, 'ranges': {}}
+    for column, entry in stats.items():
+        dtypes = entry['dtypes']
+        numeric = all(pd.api.types.is_numeric_dtype(d) and not pd.api.types.is_bool_dtype(d) for d in dtypes)
+        if numeric:
+            # Same promotion read_csv applies when it stitches its own internal chunks together
+            plan['dtypes'][column] = np.result_type(*dtypes)
+            plan['means'][column] = float(entry['sum'] / entry['count']) if entry['count'] else np.nan
+            plan['ranges'][column] = (entry['min'], entry['max'])
+        elif len(dtypes) == 1 and pd.api.types.is_bool_dtype(next(iter(dtypes))):
+            plan['dtypes'][column] = np.dtype(bool)
+        else:
+            vocab = list(entry['vocab'])
+            try:
+                vocab = sorted(vocab)
+            except TypeError:
+                pass  # mixed types: get_dummies keeps order of appearance too
+            plan['vocab'][column] = vocab
+
+    # A column that parsed as numbers in some chunks and as text in others is text throughout, as it is when
+    # read in one go; values from its numeric chunks were never collected, so read it again as text
+    mixed = [column for column in plan['vocab']
+             if any(pd.api.types.is_numeric_dtype(d) or pd.api.types.is_bool_dtype(d) for d in stats[column]['dtypes'])]
+    if mixed:
+        vocab = {column: {} for column in mixed}
+        for chunk in pd.read_csv(file_path, chunksize=chunksize, usecols=mixed, dtype=str):
+            for column in mixed:
+                for value in chunk[column].dropna().unique():
+                    vocab[column].setdefault(value, None)
+        for column in mixed:
+            plan['vocab'][column] = sorted(vocab[column])
+    return plan
+
+# Smallest integer dtype that holds every value of a column
+def smallest_int_dtype(low, high):
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return np.int64
+
+# In-memory counterpart of the chunked downcast: each integer column to the smallest dtype holding its values
+def downcast_integers(data):
+    for column in data.select_dtypes(include='integer').columns:
+        values = data[column]
+        if len(values):
+            data[column] = values.astype(smallest_int_dtype(values.min(), values.max()))
+    return data
+
+# Second pass: impute and one-hot encode chunk by chunk with the vocabularies from the first pass
+def iter_preprocessed_chunks(file_path, plan=None, chunksize=100000, downcast=False):
+    if plan is None:
+        plan = scan_csv(file_path, chunksize)
+    numeric_dtypes = {column: dtype for column, dtype in plan['dtypes'].items()}
+    categorical = list(plan['vocab'])
+    means = pd.Series(plan['means'], dtype=np.float64)
+    # Categorical columns are always read as text, so a chunk of digit-only codes still matches the vocabulary
+    dtypes = {**numeric_dtypes, **{column: str for column in categorical}}
+    for chunk in pd.read_csv(file_path, chunksize=chunksize, dtype=dtypes):
+        chunk.fillna(means, inplace=True)
+        for column in categorical:
+            chunk[column] = pd.Categorical(chunk[column], categories=plan['vocab'][column])
+        chunk = pd.get_dummies(chunk, columns=categorical, drop_first=True)
+        if downcast:
+            for column, dtype in numeric_dtypes.items():
+                if np.issubdtype(dtype, np.integer):
+                    chunk[column] = chunk[column].astype(smallest_int_dtype(*plan['ranges'][column]))
+        yield chunk
+
+# Chunked equivalent of preprocess_data(load_data(file_path)) for files too large to parse at once
+def preprocess_csv_chunked(file_path, chunksize=100000, downcast=False):
+    return pd.concat(iter_preprocessed_chunks(file_path, chunksize=chunksize, downcast=downcast))
+
+# Bump when preprocessing changes so existing caches are rebuilt
+PREPROCESS_VERSION = 3
+CACHE_DIR = '.feature_cache'
+
+# Content hash of the source file, read in blocks
+def file_digest(file_path, block_size=1 << 20):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+# Cache key covering the source bytes and every parameter that changes the output
+def feature_cache_key(digest, downcast=False):
+    params = json.dumps({'version': PREPROCESS_VERSION, 'downcast': downcast}, sort_keys=True)
+    return hashlib.blake2b(f"{digest}|{params}".encode(), digest_size=16).hexdigest()
+
+# Save a preprocessed frame as one .npy per column plus a manifest
+def save_feature_cache(data, cache_path, source=None, digest=None):
+    temp_path = tempfile.mkdtemp(dir=os.path.dirname(cache_path) or '.')
+    try:
+        columns = []
+        for i, column in enumerate(data.columns):
+            np.save(os.path.join(temp_path, f"{i}.npy"), data[column].to_numpy(), allow_pickle=False)
+            columns.append(str(column))
+        manifest = {'source': source, 'digest': digest, 'columns': columns, 'rows': len(data)}
+        with open(os.path.join(temp_path, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f)
+        # Publish atomically so a reader never sees a half-written cache
+        os.rename(temp_path, cache_path)
+    except BaseException:
+        # Without a manifest, prune_feature_cache would never find a half-written directory
+        shutil.rmtree(temp_path, ignore_errors=True)
+        raise
+
+# Load a cached frame; columns are memory-mapped, not read
+def load_feature_cache(cache_path):
+    with open(os.path.join(cache_path, 'manifest.json')) as f:
+        manifest = json.load(f)
+    columns = {column: np.load(os.path.join(cache_path, f"{i}.npy"), mmap_mode='r')
+               for i, column in enumerate(manifest['columns'])}
+    return pd.DataFrame(columns, copy=False)
+
+# Drop caches built from older contents of the same source file
+def prune_feature_cache(cache_dir, source, digest):
+    for entry in os.listdir(cache_dir):
+        manifest_path = os.path.join(cache_dir, entry, 'manifest.json')
+        if not os.path.exists(manifest_path):
+            continue
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if manifest.get('source') == source and manifest.get('digest') != digest:
+            shutil.rmtree(os.path.join(cache_dir, entry), ignore_errors=True)
+
+# Load and preprocess through the feature cache; warm runs never touch the CSV parser
+def load_preprocessed(file_path, cache_dir=CACHE_DIR, chunksize=None, downcast=False):
+    try:
+        digest = file_digest(file_path)
+    except OSError as e:
+        print(f"Error loading data: {e}")
+        return None
+    cache_path = os.path.join(cache_dir, feature_cache_key(digest, downcast))
+    if os.path.exists(cache_path):
+        print(f"Preprocessed features loaded from cache {cache_path}")
+        return load_feature_cache(cache_path)
+
+    if chunksize:
+        data = preprocess_csv_chunked(file_path, chunksize=chunksize, downcast=downcast)
+    else:
+        data = load_data(file_path)
+        if data is None:
+            return None
+        data = preprocess_data(data)
+        if downcast:
+            data = downcast_integers(data)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    source = os.path.abspath(file_path)
+    try:
+        save_feature_cache(data, cache_path, source, digest)
+    except (ValueError, OSError) as e:
+        print(f"Feature cache not written: {e}")
+        return data
+    prune_feature_cache(cache_dir, source, digest)
+    return data
+
 # Feature selection
 def feature_selection(data, target_column):
     features = data.drop(columns=[target_column])
@@ -48,11 +298,211 @@ def train_linear_regression(X_train, y_train):
     return model
 
 # Train a random forest model
-def train_random_forest(X_train, y_train):
-    model = RandomForestRegressor()
+def train_random_forest(X_train, y_train, n_jobs=-1):
+    model = RandomForestRegressor(n_jobs=n_jobs)
     model.fit(X_train, y_train)
     return model
 
+# Candidate models and hyperparameters for model selection
+def default_param_grid():
+    return [
+        {'model': [LinearRegression()]},
+        {
+            'model': [RandomForestRegressor(random_state=42)],
+            'model__n_estimators': [100, 300],
+            'model__max_depth': [None, 10, 20],
+            'model__min_samples_leaf': [1, 5],
+        },
+    ]
+
+# Dump the training data once so joblib workers memory-map it instead of each receiving a pickled copy
+def share_training_data(X_train, y_train, folder):
+    X_path = os.path.join(folder, 'X_train.joblib')
+    y_path = os.path.join(folder, 'y_train.joblib')
+    joblib.dump(np.ascontiguousarray(X_train, dtype=np.float64), X_path)
+    joblib.dump(np.ascontiguousarray(y_train, dtype=np.float64), y_path)
+    return joblib.load(X_path, mmap_mode='r'), joblib.load(y_path, mmap_mode='r')
+
+# Per-candidate scores and timings from a fitted search, best first
+def candidate_report(search):
+    results = search.cv_results_
+    report = []
+    for i, params in enumerate(results['params']):
+        entry = {
+            'model': type(params['model']).__name__,
+            'params': {k[len('model__'):]: v for k, v in params.items() if k.startswith('model__')},
+            'mse': float(-results['mean_test_score'][i]),
+            'rank': int(results['rank_test_score'][i]),
+            'fit_time': float(results['mean_fit_time'][i]),
+            'score_time': float(results['mean_score_time'][i]),
+        }
+        if 'n_resources' in results:
+            entry['n_resources'] = int(results['n_resources'][i])
+        report.append(entry)
+    # Halving searches pick the winner from the last (largest) round, so list that round first
+    return sorted(report, key=lambda entry: (-entry.get('n_resources', 0), entry['rank']))
+
+# Model selection: search every candidate of every model family in parallel
+def select_model(X_train, y_train, param_grid=None, search='grid', halving=False, n_iter=20, cv=5,
+                 n_jobs=-1, random_state=42):
+    param_grid = param_grid or default_param_grid()
+    pipeline = Pipeline([('model', LinearRegression())])
+    options = {'cv': cv, 'n_jobs': n_jobs, 'scoring': 'neg_mean_squared_error', 'refit': False}
+    if search == 'grid':
+        search_cls = HalvingGridSearchCV if halving else GridSearchCV
+        searcher = search_cls(pipeline, param_grid, **options)
+    elif search == 'random':
+        search_cls = HalvingRandomSearchCV if halving else RandomizedSearchCV
+        if not halving:
+            options['n_iter'] = n_iter
+        searcher = search_cls(pipeline, param_grid, random_state=random_state, **options)
+    else:
+        raise ValueError(f"Unknown search: {search}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        X_shared, y_shared = share_training_data(X_train, y_train, folder)
+        searcher.fit(X_shared, y_shared)
+
+    # Refit the winner on the original frame so it keeps the feature names
+    best_params = searcher.best_params_
+    model = clone(best_params['model'])
+    model.set_params(**{k[len('model__'):]: v for k, v in best_params.items() if k.startswith('model__')})
+    if 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=n_jobs)
+    model.fit(X_train, y_train)
+    return model, candidate_report(searcher)
+
+# Preprocessing state that is updated one batch of new matches at a time
+def new_preprocess_state():
+    return {'columns': None, 'numeric': [], 'categorical': [], 'sum': {}, 'count': {}, 'vocab': {}, 'features': []}
+
+# Fold a new batch into the running sums, counts and category vocabularies
+def update_preprocess_state(state, data):
+    if state['columns'] is None:
+        state['columns'] = list(data.columns)
+        for column in data.columns:
+            dtype = data[column].dtype
+            if pd.api.types.is_bool_dtype(dtype):
+                continue
+            if pd.api.types.is_numeric_dtype(dtype):
+                state['numeric'].append(column)
+            else:
+                state['categorical'].append(column)
+    elif set(data.columns) != set(state['columns']):
+        raise ValueError("New data has different columns; retrain from scratch")
+
+    for column in state['numeric']:
+        values = data[column].dropna().to_numpy(dtype=np.float64)
+        state['sum'][column] = state['sum'].get(column, Fraction(0)) + exact_sum(values)
+        state['count'][column] = state['count'].get(column, 0) + len(values)
+    for column in state['categorical']:
+        # Categories keep their order of appearance so the dropped dummy never changes
+        vocab = state['vocab'].setdefault(column, [])
+        known = set(vocab)
+        vocab.extend(value for value in data[column].dropna().unique() if value not in known)
+    return state
+
+# Impute and encode a batch with the current state; dummy columns for new categories go at the end
+def transform_incremental(state, data):
+    means = pd.Series({column: float(state['sum'][column] / state['count'][column]) if state['count'][column]
+                       else np.nan for column in state['numeric']}, dtype=np.float64)
+    data = data[state['columns']].fillna(means)
+    for column in state['categorical']:
+        data[column] = pd.Categorical(data[column], categories=state['vocab'][column])
+    data = pd.get_dummies(data, columns=state['categorical'], drop_first=True)
+    state['features'].extend(column for column in data.columns if column not in state['features'])
+    return data[state['features']]
+
+# Centered sufficient statistics for least squares: row count, means and co-moment matrices
+def linear_stats(X, y):
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x_mean = X.mean(axis=0)
+    y_mean = y.mean()
+    X_centered = X - x_mean
+    return {'n': len(X), 'x_mean': x_mean, 'y_mean': y_mean,
+            'xx': X_centered.T @ X_centered, 'xy': X_centered.T @ (y - y_mean)}
+
+# Combine statistics of two batches; feature columns the older batch lacks were all zero there
+def merge_linear_stats(old, new):
+    if old is None:
+        return new
+    pad = len(new['x_mean']) - len(old['x_mean'])
+    x_mean_old = np.pad(old['x_mean'], (0, pad))
+    n = old['n'] + new['n']
+    dx = new['x_mean'] - x_mean_old
+    dy = new['y_mean'] - old['y_mean']
+    weight = old['n'] * new['n'] / n
+    return {
+        'n': n,
+        'x_mean': x_mean_old + dx * new['n'] / n,
+        'y_mean': old['y_mean'] + dy * new['n'] / n,
+        'xx': np.pad(old['xx'], (0, pad)) + new['xx'] + weight * np.outer(dx, dx),
+        'xy': np.pad(old['xy'], (0, pad)) + new['xy'] + weight * dx * dy,
+    }
+
+# Fitted LinearRegression solved from the statistics alone, without revisiting any rows
+def linear_model_from_stats(stats, feature_names):
+    coef, _, rank, singular = np.linalg.lstsq(stats['xx'], stats['xy'], rcond=None)
+    model = LinearRegression()
+    model.coef_ = coef
+    model.intercept_ = stats['y_mean'] - stats['x_mean'] @ coef
+    model.n_features_in_ = len(coef)
+    model.feature_names_in_ = np.asarray(feature_names, dtype=object)
+    model.rank_ = rank
+    model.singular_ = np.sqrt(singular)
+    return model
+
+# Make room in a fitted tree for feature columns added after it was trained; it never splits on them
+def widen_tree(tree, n_features):
+    widened = Tree(n_features, tree.tree_.n_classes, tree.tree_.n_outputs)
+    widened.__setstate__(tree.tree_.__getstate__())
+    tree.tree_ = widened
+    tree.n_features_in_ = n_features
+
+# Grow a fitted forest with trees trained only on the new batch
+def add_forest_trees(model, X_new, y_new, n_new_trees):
+    for tree in model.estimators_:
+        if tree.n_features_in_ < X_new.shape[1]:
+            widen_tree(tree, X_new.shape[1])
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + n_new_trees)
+    model.fit(X_new, y_new)
+    return model
+
+INCREMENTAL_STATE_FILE = 'incremental_state.pkl'
+
+# Incremental training: work proportional to the new matches, not the whole history
+def train_incremental(new_data, target_column, state=None):
+    if state is None:
+        state = {'preprocess': new_preprocess_state(), 'linear_stats': None, 'forest': None}
+    update_preprocess_state(state['preprocess'], new_data)
+    data = transform_incremental(state['preprocess'], new_data)
+    features, target = feature_selection(data, target_column)
+
+    seen = state['linear_stats']['n'] if state['linear_stats'] else 0
+    state['linear_stats'] = merge_linear_stats(state['linear_stats'], linear_stats(features, target))
+    lr_model = linear_model_from_stats(state['linear_stats'], features.columns)
+
+    if state['forest'] is None:
+        state['forest'] = train_random_forest(features, target)
+    else:
+        # Trees in proportion to rows, so every match carries about the same weight in the average
+        n_new_trees = max(1, round(len(state['forest'].estimators_) * len(features) / seen))
+        add_forest_trees(state['forest'], features, target, n_new_trees)
+    return lr_model, state['forest'], state
+
+# Fold a file of new matches into the saved incremental state and models
+def update_models(file_path, target_column, state_file=INCREMENTAL_STATE_FILE):
+    new_data = load_data(file_path)
+    if new_data is None:
+        return None
+    state = joblib.load(state_file) if os.path.exists(state_file) else None
+    lr_model, rf_model, state = train_incremental(new_data, target_column, state)
+    joblib.dump(state, state_file)
+    save_model(lr_model, 'linear_regression_model.pkl')
+    save_model(rf_model, 'random_forest_model.pkl')
+    return lr_model, rf_model
+
 # Evaluate model performance
 def evaluate_model(model, X_test, y_test):
     predictions = model.predict(X_test)
@@ -70,25 +520,71 @@ def load_model(filename):
     print(f"Model loaded from {filename}")
     return model
 
+IMPORTANCE_CACHE_DIR = '.importance_cache'
+
+# Permutation importance; sklearn shuffles the features in parallel across n_jobs workers
+def _permutation_importance(model, X, y, n_repeats, random_state, n_jobs):
+    result = permutation_importance(model, X, y, scoring='neg_mean_squared_error', n_repeats=n_repeats,
+                                    random_state=random_state, n_jobs=n_jobs)
+    return result.importances_mean, result.importances_std
+
+# Impurity or permutation importances with their spread; permutation results are cached by model and data hash
+def compute_feature_importance(model, X=None, y=None, method='impurity', n_repeats=5, random_state=42,
+                               n_jobs=-1, cache_dir=IMPORTANCE_CACHE_DIR):
+    if method == 'impurity':
+        return model.feature_importances_, None
+    if method != 'permutation':
+        raise ValueError(f"Unknown importance method: {method}")
+    if X is None or y is None:
+        raise ValueError("Permutation importance needs evaluation data X and y")
+    if cache_dir is None:
+        return _permutation_importance(model, X, y, n_repeats, random_state, n_jobs)
+    cached = joblib.Memory(cache_dir, verbose=0).cache(_permutation_importance, ignore=['n_jobs'])
+    return cached(model, X, y, n_repeats, random_state, n_jobs)
+
+# Indices of the k largest importances, best first, via a partial sort instead of sorting every feature
+def top_k_features(importances, k):
+    importances = np.asarray(importances)
+    k = min(k, len(importances))
+    if k <= 0:
+        return np.array([], dtype=int)
+    top = np.argpartition(importances, len(importances) - k)[len(importances) - k:]
+    return top[np.argsort(importances[top])[::-1]]
+
+# Render the top-k importances to a file; the extension picks the format (png, svg, ...)
+def render_feature_importance(feature_names, importances, filename, k=10, std=None, title=None):
+    # Plotting libraries are only needed here; a bare Figure never touches an interactive backend
+    import seaborn as sns
+    from matplotlib.figure import Figure
+
+    importances = np.asarray(importances)
+    top = top_k_features(importances, k)
+    names = [str(name) for name in np.asarray(feature_names, dtype=object)[top]]
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    sns.barplot(x=importances[top], y=names, errorbar=None, ax=ax)
+    if std is not None:
+        ax.errorbar(importances[top], range(len(top)), xerr=np.asarray(std)[top], fmt='none', ecolor='black')
+    ax.set_xlabel('Importance')
+    ax.set_title(title or f'Top {len(top)} Feature Importances')
+    fig.tight_layout()
+    fig.savefig(filename)
+    return filename
+
 # Feature importance
-def plot_feature_importance(model, feature_names):
-    importance = model.feature_importances_
-    feature_importance_df = pd.DataFrame({'Feature': feature_names, 'Importance': importance})
-    feature_importance_df = feature_importance_df.sort_values('Importance', ascending=False)
-    
-    plt.figure(figsize=(12, 6))
-    sns.barplot(x='Importance', y='Feature', data=feature_importance_df.head(10))
-    plt.title('Top 10 Feature Importances')
-    plt.show()
+def plot_feature_importance(model, feature_names, filename='feature_importance.png', k=10, X=None, y=None,
+                            method='impurity'):
+    importances, std = compute_feature_importance(model, X, y, method=method)
+    render_feature_importance(feature_names, importances, filename, k=k, std=std)
+    print(f"Feature importance plot saved to {filename}")
 
 # Main function
 def main():
     file_path = 'sports_data.csv'  # Change this to your dataset path
     target_column = 'performance_score'  # Change to your target column
-    data = load_data(file_path)
+    data = load_preprocessed(file_path)
     
     if data is not None:
-        data = preprocess_data(data)
         features, target = feature_selection(data, target_column)
         X_train, X_test, y_train, y_test = split_data(features, target)
 
@@ -102,12 +598,23 @@ def main():
         rf_mse = evaluate_model(rf_model, X_test, y_test)
         print(f'Random Forest MSE: {rf_mse}')
 
+        # Model selection across both families with successive halving
+        best_model, candidates = select_model(X_train, y_train, halving=True)
+        best_mse = evaluate_model(best_model, X_test, y_test)
+        print(f'Best model ({type(best_model).__name__}) MSE: {best_mse}')
+        for candidate in candidates:
+            print(f"  rank {candidate['rank']:>3} {candidate['model']} {candidate['params']} "
+                  f"cv MSE {candidate['mse']:.4f} fit {candidate['fit_time']:.3f}s")
+
         # Save the models
         save_model(lr_model, 'linear_regression_model.pkl')
         save_model(rf_model, 'random_forest_model.pkl')
+        save_model(best_model, 'best_model.pkl')
 
         # Feature importance
         plot_feature_importance(rf_model, features.columns)
+        plot_feature_importance(rf_model, features.columns, 'permutation_importance.png', X=X_test, y=y_test,
+                                method='permutation')
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,132 @@
+import argparse
+import http.client
+import json
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+# One keep-alive connection per load-generator thread
+connections = threading.local()
+
+def _connection(host, port):
+    if getattr(connections, 'conn', None) is None:
+        connections.conn = http.client.HTTPConnection(host, port, timeout=10)
+    return connections.conn
+
+def send(host, port, method, path, body=None, headers=None):
+    conn = _connection(host, port)
+    try:
+        conn.request(method, path, body=body, headers=headers or {})
+        response = conn.getresponse()
+        data = response.read()
+        return response.status, data
+    except (OSError, http.client.HTTPException):
+        conn.close()
+        connections.conn = None
+        return 0, b''
+
+# Start the app on a free local port in a background thread
+def start_local_server():
+    from werkzeug.serving import make_server
+    import api_security
+
+    server = make_server('127.0.0.1', 0, api_security.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+def login(host, port, username='user1', password='password1'):
+    status, data = send(host, port, 'POST', '/login', json.dumps({'username': username, 'password': password}),
+                        {'Content-Type': 'application/json'})
+    if status != 200:
+        raise RuntimeError(f"Login failed with status {status}")
+    return json.loads(data)['token']
+
+# Open-loop load: requests are scheduled at a fixed rate and latency counts from the scheduled time,
+# so a slow server shows up as latency instead of silently lowering the offered load
+def run_load(url, rps, duration, login_ratio=0.1, api_keys=1000, concurrency=32, seed=0):
+    target = urlparse(url)
+    host, port = target.hostname, target.port or 80
+    token = login(host, port)
+    rng = random.Random(seed)
+    login_body = json.dumps({'username': 'user1', 'password': 'password1'})
+    results = {'/login': [], '/api/resource': []}
+    statuses = {}
+    lock = threading.Lock()
+
+    def fire(path, scheduled, headers, body):
+        status, _ = send(host, port, 'POST' if body else 'GET', path, body, headers)
+        latency = time.perf_counter() - scheduled
+        with lock:
+            results[path].append(latency)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    total = int(rps * duration)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for i in range(total):
+            scheduled = start + i / rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            if rng.random() < login_ratio:
+                pool.submit(fire, '/login', scheduled, {'Content-Type': 'application/json'}, login_body)
+            else:
+                headers = {'Authorization': f"Bearer {token}", 'X-API-KEY': f"load-{rng.randrange(api_keys)}"}
+                pool.submit(fire, '/api/resource', scheduled, headers, None)
+    elapsed = time.perf_counter() - start
+    return summarize(results, statuses, elapsed)
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+def summarize(results, statuses, elapsed):
+    report = {'elapsed_seconds': elapsed, 'statuses': statuses, 'endpoints': {}}
+    completed = 0
+    for path, latencies in results.items():
+        completed += len(latencies)
+        report['endpoints'][path] = {
+            'requests': len(latencies),
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+        }
+    report['throughput_rps'] = completed / elapsed if elapsed else 0.0
+    return report
+
+# Main function
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive /login and /api/resource at a target request rate")
+    parser.add_argument('--url', help="server to test; by default the app is started in-process")
+    parser.add_argument('--rps', type=float, default=200)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--login-ratio', type=float, default=0.1, help="share of requests that go to /login")
+    parser.add_argument('--api-keys', type=int, default=1000, help="distinct X-API-KEY values to spread the rate limit")
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--output', help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    server = None
+    url = args.url
+    if url is None:
+        server, url = start_local_server()
+    try:
+        report = run_load(url, args.rps, args.duration, args.login_ratio, args.api_keys, args.concurrency)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    print(f"{report['throughput_rps']:.1f} req/s over {report['elapsed_seconds']:.1f}s, statuses {report['statuses']}")
+    for path, stats in report['endpoints'].items():
+        print(f"{path:<14} {stats['requests']:>7} requests  p50 {stats['p50_ms']:.2f} ms  p99 {stats['p99_ms']:.2f} ms")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=4)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
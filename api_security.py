@@ -1,25 +1,384 @@
 import time
+import os
+import math
+import mmap
+import fcntl
+import stat
+import struct
+import hashlib
+import tempfile
+import threading
+import queue
+import atexit
+from bisect import bisect_left
+from contextlib import contextmanager
+from collections import OrderedDict
+from functools import lru_cache
+from urllib.parse import urlparse
 import jwt
 from flask import Flask, request, jsonify, g
 from functools import wraps
 from flask_limiter import Limiter, RateLimitExceeded
+from flask_limiter.util import get_remote_address
+from limits.storage import Storage, SlidingWindowCounterSupport
 from flask_cors import CORS
 import logging
-import traceback
-from werkzeug.exceptions import Unauthorized
+from logging.handlers import QueueHandler, QueueListener
+from werkzeug.exceptions import HTTPException, Unauthorized
 
 # Configuration
 SECRET_KEY = 'your_secret_key'
 JWT_EXPIRATION_DELTA = 3600  # token expiration time in seconds
 LIMIT = "100/hour"  # rate limit configuration
+TOKEN_CACHE_SIZE = 10000  # verified tokens kept per worker
+SHM_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+# Shared-memory files live in a directory only this user can enter; give each deployment its own
+RUNTIME_DIR = os.environ.get('RUNTIME_DIR', os.path.join(SHM_DIR, f'api_security-{os.getuid()}'))
+REVOCATION_FILE = os.environ.get('REVOCATION_FILE', os.path.join(RUNTIME_DIR, 'revoked'))
+REVOCATION_SLOTS = 65536
+# Any limits storage URI works here, e.g. memory:// or redis://localhost:6379
+RATE_LIMIT_STORAGE_URI = os.environ.get('RATE_LIMIT_STORAGE_URI', f"shm://{os.path.join(RUNTIME_DIR, 'ratelimit')}")
+RATE_LIMIT_SLOTS = 65536
+METRICS_FILE = os.environ.get('METRICS_FILE', os.path.join(RUNTIME_DIR, 'metrics'))
+METRICS_SLOTS = 1024
+
+# Create the runtime directory, or check that an existing one is ours and closed to other users
+def private_runtime_dir(path=RUNTIME_DIR):
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{path} must be a directory private to this user")
+    return path
+
+# A fixed-size file mapped into memory by every worker process on the host.
+# flock locks belong to the open file, and a worker forked after import (e.g. gunicorn --preload)
+# would otherwise share the parent's and never exclude its siblings, so each process opens its own.
+class SharedMapping:
+    def _open_mapping(self, path, size):
+        self.path = path
+        self.size = size
+        self.fd = None
+        self.pid = None
+        # flock is per open file, so threads of one worker also need a lock of their own
+        self.thread_lock = threading.Lock()
+        self._attach()
+
+    def _attach(self):
+        if os.path.dirname(self.path) == RUNTIME_DIR:
+            private_runtime_dir()
+        # Never follow a planted symlink, and only trust a file this user created for itself
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+        info = os.fstat(fd)
+        if not stat.S_ISREG(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+            os.close(fd)
+            raise PermissionError(f"{self.path} must be a regular file private to this user")
+        if info.st_size < self.size:
+            os.ftruncate(fd, self.size)
+        mapping = mmap.mmap(fd, os.fstat(fd).st_size)
+        if self.fd is not None:
+            os.close(self.fd)
+        self.fd, self.map, self.pid = fd, mapping, os.getpid()
+
+    # Exclusive against other threads of this worker and against every other worker
+    def _lock(self):
+        self.thread_lock.acquire()
+        if self.pid != os.getpid():
+            self._attach()
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+
+    def _unlock(self):
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self.thread_lock.release()
+
+# Stable 64-bit hash of a rate-limit key; str hashes are salted per process so cannot be shared
+@lru_cache(maxsize=65536)
+def key_hash(key):
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little') or 1
+
+# Rate-limit counters in a memory-mapped file, shared by every worker process on the host.
+# A sliding-window key keeps both of its windows in one slot, so an acquire reads and writes a single record.
+class SharedMemoryStorage(Storage, SlidingWindowCounterSupport, SharedMapping):
+    STORAGE_SCHEME = ['shm']
+    SLOT = struct.Struct('Qdqqq')  # key hash, slot expiry, window number, current count, previous count
+    MAX_PROBES = 32
+
+    def __init__(self, uri=None, wrap_exceptions=False, slots=RATE_LIMIT_SLOTS, **options):
+        super().__init__(uri, wrap_exceptions, **options)
+        path = urlparse(uri).path if uri else os.path.join(RUNTIME_DIR, 'ratelimit')
+        self._open_mapping(path, int(slots) * self.SLOT.size)
+        self.slots = len(self.map) // self.SLOT.size
+
+    @property
+    def base_exceptions(self):
+        return (OSError, RuntimeError)
+
+    # Slot for a key: (offset, record), with a fresh record in a free slot when absent and create is set
+    def _find(self, key, now, create=False):
+        target = key_hash(key)
+        free = None
+        for i in range(self.MAX_PROBES):
+            offset = ((target + i) % self.slots) * self.SLOT.size
+            record = self.SLOT.unpack_from(self.map, offset)
+            if record[0] == target:
+                return offset, record
+            if free is None and (record[0] == 0 or record[1] <= now):
+                free = offset
+            if record[0] == 0:
+                break
+        if not create:
+            return None, None
+        if free is None:
+            raise RuntimeError("Rate limit storage is full")
+        return free, (target, 0.0, 0, 0, 0)
+
+    # Plain counters, used by the fixed-window strategy
+    def incr(self, key, expiry, amount=1):
+        self._lock()
+        try:
+            now = time.time()
+            offset, (target, expires, _, count, _) = self._find(key, now, create=True)
+            if expires <= now:
+                count, expires = 0, now + expiry
+            self.SLOT.pack_into(self.map, offset, target, expires, 0, count + amount, 0)
+            return count + amount
+        finally:
+            self._unlock()
+
+    def _get(self, key):
+        now = time.time()
+        offset, record = self._find(key, now)
+        if offset is None or record[1] <= now:
+            return 0, now
+        return record[3], record[1]
+
+    def get(self, key):
+        self._lock()
+        try:
+            return self._get(key)[0]
+        finally:
+            self._unlock()
+
+    def get_expiry(self, key):
+        self._lock()
+        try:
+            return self._get(key)[1]
+        finally:
+            self._unlock()
+
+    def clear(self, key):
+        self._lock()
+        try:
+            offset, record = self._find(key, time.time())
+            if offset is not None:
+                self.SLOT.pack_into(self.map, offset, record[0], 0.0, 0, 0, 0)
+        finally:
+            self._unlock()
+
+    def check(self):
+        return True
+
+    def reset(self):
+        self._lock()
+        try:
+            self.map[:] = bytes(len(self.map))
+        finally:
+            self._unlock()
+        return None
+
+    # Counts of the previous and current windows as of now, shifting the stored pair when windows have passed
+    def _window(self, key, expiry, now, create=False):
+        window = int(now / expiry)
+        offset, record = self._find(key, now, create)
+        if offset is None:
+            return None, record, window, 0, 0
+        target, expires, stored_window, current, previous = record
+        if expires <= now or stored_window < window - 1:
+            current, previous = 0, 0
+        elif stored_window == window - 1:
+            current, previous = 0, current
+        return offset, target, window, current, previous
+
+    def _previous_ttl(self, expiry, now, previous):
+        return (1 - (((now - expiry) / expiry) % 1)) * expiry if previous else 0.0
+
+    # Check and increment under one lock, so concurrent workers can never overshoot the limit
+    def acquire_sliding_window_entry(self, key, limit, expiry, amount=1):
+        if amount > limit:
+            return False
+        self._lock()
+        try:
+            now = time.time()
+            offset, target, window, current, previous = self._window(key, expiry, now, create=True)
+            if math.floor(previous * self._previous_ttl(expiry, now, previous) / expiry + current) + amount > limit:
+                return False
+            # The slot stays live until the current window has also served as a previous one
+            self.SLOT.pack_into(self.map, offset, target, (window + 2) * expiry, window, current + amount, previous)
+            return True
+        finally:
+            self._unlock()
+
+    def get_sliding_window(self, key, expiry):
+        self._lock()
+        try:
+            now = time.time()
+            _, _, _, current, previous = self._window(key, expiry, now)
+        finally:
+            self._unlock()
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous, self._previous_ttl(expiry, now, previous), current, current_ttl
+
+    def clear_sliding_window(self, key, expiry):
+        self.clear(key)
+
+# Rate limit per API key, or per client address when no key is sent
+def rate_limit_key():
+    api_key = request.headers.get('X-API-KEY')
+    return f"key:{api_key}" if api_key else f"ip:{get_remote_address()}"
 
 # Initialize Flask app and extensions
 app = Flask(__name__)
 CORS(app)
-limiter = Limiter(app, key_func=lambda: request.headers.get('X-API-KEY'))
+limiter = Limiter(key_func=rate_limit_key, app=app, storage_uri=RATE_LIMIT_STORAGE_URI,
+                  strategy='sliding-window-counter')
+
+# Log records are handed to a background thread; formatting and writing never block a request
+class DeferredQueueHandler(QueueHandler):
+    # The queue stays in-process, so records need not be formatted or made picklable here
+    def prepare(self, record):
+        return record
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
+log_output = logging.StreamHandler()
+log_output.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+log_handler = DeferredQueueHandler(queue.SimpleQueue())
+logging.basicConfig(level=logging.INFO, handlers=[log_handler])
+log_listener = None
+
+# Threads do not survive a fork, so a worker forked after import (gunicorn --preload) starts its own
+# listener on a fresh queue instead of filling one that nothing drains
+def start_log_listener():
+    global log_listener
+    log_handler.queue = queue.SimpleQueue()
+    log_listener = QueueListener(log_handler.queue, log_output)
+    log_listener.start()
+
+def stop_log_listener():
+    if log_listener is not None:
+        log_listener.stop()
+
+start_log_listener()
+os.register_at_fork(after_in_child=start_log_listener)
+atexit.register(stop_log_listener)
+
+# Latency histograms with fixed buckets, in seconds, kept in a memory-mapped file so that every
+# worker process adds to the same counters and a scrape of any worker reports the whole service
+class SharedHistograms(SharedMapping):
+    BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+               0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+    HEADER = struct.Struct('Q64s')  # name hash, name
+    VALUES = struct.Struct(f'{len(BUCKETS) + 1}qdq')  # bucket counts, sum, count
+    MAX_PROBES = 32
+
+    def __init__(self, path=METRICS_FILE, slots=METRICS_SLOTS):
+        self.slot_size = self.HEADER.size + self.VALUES.size
+        self._open_mapping(path, slots * self.slot_size)
+        self.slots = len(self.map) // self.slot_size
+        # Slot offsets never move, so each process looks a name up once
+        self.offsets = {}
+
+    # Offset of a histogram's counters, claiming a free slot the first time any worker sees the name
+    def _offset(self, name):
+        offset = self.offsets.get(name)
+        if offset is not None:
+            return offset
+        target = key_hash(name)
+        encoded = name.encode()[:self.HEADER.size - 8]
+        for i in range(self.MAX_PROBES):
+            offset = ((target + i) % self.slots) * self.slot_size
+            stored = self.HEADER.unpack_from(self.map, offset)[0]
+            if stored == 0:
+                self.HEADER.pack_into(self.map, offset, target, encoded)
+            if stored in (0, target):
+                self.offsets[name] = offset + self.HEADER.size
+                return self.offsets[name]
+        raise RuntimeError("Metrics storage is full")
+
+    def observe(self, name, seconds):
+        index = bisect_left(self.BUCKETS, seconds)
+        self._lock()
+        try:
+            offset = self._offset(name)
+            values = list(self.VALUES.unpack_from(self.map, offset))
+            values[index] += 1
+            values[-2] += seconds
+            values[-1] += 1
+            self.VALUES.pack_into(self.map, offset, *values)
+        finally:
+            self._unlock()
+
+    # Plain counter: only the count field of its slot is used
+    def add(self, name, amount=1):
+        self._lock()
+        try:
+            offset = self._offset(name) + self.VALUES.size - 8
+            struct.pack_into('q', self.map, offset, struct.unpack_from('q', self.map, offset)[0] + amount)
+        finally:
+            self._unlock()
+
+    # Name -> (bucket counts, sum, count) of every histogram and counter recorded by any worker
+    def snapshot(self):
+        result = {}
+        self._lock()
+        try:
+            for offset in range(0, self.slots * self.slot_size, self.slot_size):
+                target, name = self.HEADER.unpack_from(self.map, offset)
+                if target:
+                    values = self.VALUES.unpack_from(self.map, offset + self.HEADER.size)
+                    result[name.rstrip(b'\0').decode()] = (values[:-2], values[-2], values[-1])
+        finally:
+            self._unlock()
+        return result
+
+    def reset(self):
+        self._lock()
+        try:
+            self.map[:] = bytes(len(self.map))
+            self.offsets.clear()
+        finally:
+            self._unlock()
+
+    # Prometheus text format: cumulative buckets, sum and count
+    @classmethod
+    def exposition(cls, name, labels, histogram):
+        counts, total, count = histogram
+        lines = []
+        cumulative = 0
+        for bound, bucket in zip(cls.BUCKETS + ('+Inf',), counts):
+            cumulative += bucket
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_sum{{{labels}}} {total}')
+        lines.append(f'{name}_count{{{labels}}} {count}')
+        return lines
+
+# Per-stage and per-endpoint histograms and token cache counters of the whole service
+histograms = SharedHistograms()
+
+# Time one stage of the current request; time spent in stages nested inside it is left to them
+@contextmanager
+def stage(name):
+    nested = g.setdefault('stage_stack', [])
+    nested.append(0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        histograms.observe(name, elapsed - nested.pop())
+        if nested:
+            nested[-1] += elapsed
 
 # A dummy user database for example purposes
 users_db = {
@@ -35,16 +394,136 @@ def generate_token(username):
     }
     return jwt.encode(payload, SECRET_KEY, algorithm='HS256')
 
-# Token verification
-def verify_token(token):
+# Cache key for a token; the raw token never needs to be kept
+def token_digest(token):
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+# Revoked token digests for a single process
+class RevocationList:
+    def __init__(self):
+        self.revoked = {}
+        self.lock = threading.Lock()
+
+    def add(self, digest, expires):
+        with self.lock:
+            now = time.time()
+            self.revoked = {d: exp for d, exp in self.revoked.items() if exp > now}
+            self.revoked[digest] = expires
+
+    def __contains__(self, digest):
+        expires = self.revoked.get(digest)
+        return expires is not None and expires > time.time()
+
+# Revoked token digests in a memory-mapped file, shared by every worker process on the host
+class SharedRevocationList(SharedMapping):
+    SLOT = struct.Struct('16sd')  # token digest, expiry timestamp
+    MAX_PROBES = 64
+
+    def __init__(self, path=REVOCATION_FILE, slots=REVOCATION_SLOTS):
+        self._open_mapping(path, slots * self.SLOT.size)
+        self.slots = len(self.map) // self.SLOT.size
+
+    def _probe(self, digest):
+        start = int.from_bytes(digest[:8], 'little')
+        for i in range(self.MAX_PROBES):
+            yield ((start + i) % self.slots) * self.SLOT.size
+
+    # Writers serialize on a file lock; expired slots are reused in place
+    def add(self, digest, expires):
+        self._lock()
+        try:
+            now = time.time()
+            for offset in self._probe(digest):
+                current, current_expires = self.SLOT.unpack_from(self.map, offset)
+                if current == digest or current_expires <= now:
+                    # Expiry first: a reader that already sees the new digest also sees its expiry
+                    struct.pack_into('d', self.map, offset + 16, expires)
+                    self.map[offset:offset + 16] = digest
+                    return
+            raise RuntimeError("Revocation list is full")
+        finally:
+            self._unlock()
+
+    # Readers take no lock; a lookup is a few slot comparisons
+    def __contains__(self, digest):
+        for offset in self._probe(digest):
+            current = self.map[offset:offset + 16]
+            if current == digest:
+                return struct.unpack_from('d', self.map, offset + 16)[0] > time.time()
+            if current == b'\0' * 16:
+                return False
+        return False
+
+# Bounded LRU of verified tokens; entries expire with the token's own exp claim
+class TokenCache:
+    def __init__(self, max_entries=TOKEN_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, digest):
+        with self.lock:
+            entry = self.entries.get(digest)
+            if entry is not None:
+                if entry[1] > time.time():
+                    self.entries.move_to_end(digest)
+                    self.hits += 1
+                    return entry[0]
+                del self.entries[digest]
+            self.misses += 1
+            return None
+
+    def put(self, digest, username, expires):
+        with self.lock:
+            self.entries[digest] = (username, expires)
+            self.entries.move_to_end(digest)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def discard(self, digest):
+        with self.lock:
+            self.entries.pop(digest, None)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.entries),
+                'hit_rate': self.hits / lookups if lookups else 0.0}
+
+# Verified tokens are cached per worker; revocations are shared across workers
+token_cache = TokenCache()
+revoked_tokens = SharedRevocationList()
+
+# Token decoding and signature check
+def decode_token(token):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
-        return payload['sub']
+        return jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
     except jwt.ExpiredSignatureError:
         raise Unauthorized("Token has expired.")
     except jwt.InvalidTokenError:
         raise Unauthorized("Invalid token.")
 
+# Token verification
+def verify_token(token):
+    digest = token_digest(token)
+    if digest in revoked_tokens:
+        raise Unauthorized("Token has been revoked.")
+    username = token_cache.get(digest)
+    histograms.add('counter:token_cache_hits' if username is not None else 'counter:token_cache_misses')
+    if username is not None:
+        return username
+    payload = decode_token(token)
+    token_cache.put(digest, payload['sub'], payload.get('exp', time.time() + JWT_EXPIRATION_DELTA))
+    return payload['sub']
+
+# Token revocation; only tokens that verify can be revoked, and only until they expire anyway
+def revoke_token(token):
+    payload = decode_token(token)
+    digest = token_digest(token)
+    revoked_tokens.add(digest, payload.get('exp', time.time() + JWT_EXPIRATION_DELTA))
+    token_cache.discard(digest)
+
 # Rate limit error handler
 @app.errorhandler(RateLimitExceeded)
 def handle_rate_limit_error(e):
@@ -54,40 +533,93 @@ def handle_rate_limit_error(e):
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = request.headers.get('Authorization')
-        if not token:
-            raise Unauthorized("Token is missing.")
+        with stage('token_parse'):
+            token = request.headers.get('Authorization')
+            if not token:
+                raise Unauthorized("Token is missing.")
+            token = token.split(" ")[1]
         try:
-            username = verify_token(token.split(" ")[1])
+            with stage('verify_token'):
+                username = verify_token(token)
         except Unauthorized as e:
             return jsonify(message=str(e)), 401
         g.username = username
-        return f(*args, **kwargs)
+        # Any limit decorator below this one is timed here; the view times its own stages
+        with stage('limiter'):
+            return f(*args, **kwargs)
     return decorated
 
 # Login endpoint
 @app.route('/login', methods=['POST'])
 def login():
-    auth_data = request.json
-    username = auth_data.get('username')
-    password = auth_data.get('password')
+    with stage('handler'):
+        auth_data = request.json
+        username = auth_data.get('username')
+        password = auth_data.get('password')
 
-    if username in users_db and users_db[username] == password:
-        token = generate_token(username)
-        return jsonify(token=token), 200
-    return jsonify(message="Invalid credentials."), 401
+        if username in users_db and users_db[username] == password:
+            token = generate_token(username)
+            with stage('serialize'):
+                return jsonify(token=token), 200
+        with stage('serialize'):
+            return jsonify(message="Invalid credentials."), 401
+
+# Logout endpoint: revokes the presented token in every worker
+@app.route('/logout', methods=['POST'])
+@token_required
+def logout():
+    revoke_token(request.headers['Authorization'].split(" ")[1])
+    return jsonify(message="Token revoked."), 200
 
 # Sample API endpoint
 @app.route('/api/resource', methods=['GET'])
 @token_required
 @limiter.limit(LIMIT)
 def protected_resource():
-    return jsonify(message=f"Welcome {g.username}, here is your protected resource."), 200
+    with stage('handler'):
+        message = f"Welcome {g.username}, here is your protected resource."
+        with stage('serialize'):
+            return jsonify(message=message), 200
+
+# Whole-request latency per endpoint
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_time(response):
+    start = g.get('request_start')
+    if start is not None:
+        histograms.observe(f"request:{request.endpoint}", time.perf_counter() - start)
+    return response
+
+# Metrics endpoint: stage and request histograms and token cache counters summed over all workers
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    snapshot = sorted(histograms.snapshot().items())
+    lines = ['# TYPE api_stage_seconds histogram']
+    for name, histogram in snapshot:
+        if ':' not in name:
+            lines.extend(SharedHistograms.exposition('api_stage_seconds', f'stage="{name}"', histogram))
+    lines.append('# TYPE api_request_seconds histogram')
+    for name, histogram in snapshot:
+        if name.startswith('request:'):
+            endpoint = name[len('request:'):]
+            lines.extend(SharedHistograms.exposition('api_request_seconds', f'endpoint="{endpoint}"', histogram))
+    counters = dict(snapshot)
+    for name in ('token_cache_hits', 'token_cache_misses'):
+        lines.append(f'# TYPE api_{name}_total counter')
+        lines.append(f"api_{name}_total {counters.get(f'counter:{name}', ((), 0.0, 0))[2]}")
+    return '\n'.join(lines) + '\n', 200, {'Content-Type': 'text/plain; version=0.0.4'}
 
 # Error handler for internal server errors
 @app.errorhandler(Exception)
 def handle_exception(e):
-    logging.error("An error occurred: %s", traceback.format_exc())
+    # HTTP errors such as a missing token keep their status; they are not server faults
+    if isinstance(e, HTTPException):
+        return jsonify(message=str(e)), e.code
+    # The traceback is formatted on the logging thread, not in the request
+    logging.error("An error occurred: %s", e, exc_info=e)
     return jsonify(error="Internal Server Error", message=str(e)), 500
 
 # Main entry point
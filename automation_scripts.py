@@ -1,8 +1,11 @@
 import os
+import asyncio
+import importlib.util
 import requests
+import aiohttp
 import csv
 import time
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from datetime import datetime
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
@@ -11,6 +14,7 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import logging
 import random
+from urllib.parse import urlparse
 
 # Logging configuration
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -18,6 +22,7 @@ logger = logging.getLogger(__name__)
 
 # Configurations
 URL = "https://example.com"
+URLS = [URL]  # pages monitored each cycle
 OUTPUT_CSV = "output/data.csv"
 CHECK_INTERVAL = 60  # seconds
 WATCH_DIRECTORY = "watch_folder"
@@ -25,23 +30,132 @@ EMAIL_ADDRESS = "youremail@example.com"
 EMAIL_PASSWORD = "yourpassword"
 SMTP_SERVER = "smtp.example.com"
 SMTP_PORT = 587
+PER_HOST_LIMIT = 4  # concurrent requests per host
+TOTAL_LIMIT = 100  # concurrent requests overall
+REQUEST_TIMEOUT = 30  # seconds
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5  # seconds, doubled on every retry
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# lxml parses several times faster than the pure-Python parser; fall back when it is not installed
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+# Only the item blocks are built into a tree; the rest of the page is skipped while parsing
+ITEM_STRAINER = SoupStrainer('div', class_='item')
+
+# Reused connection pool for the blocking scraper
+session = requests.Session()
+
+# Function to extract the items from a page
+def parse_items(html):
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=ITEM_STRAINER)
+    data = []
+    for item in soup.find_all('div', class_='item'):
+        title = item.find('h2')
+        link = item.find('a', href=True)
+        if title is None or link is None:
+            continue
+        data.append({'title': title.text, 'link': link['href']})
+    return data
 
 # Function to scrape data from a website
 def scrape_data(url):
     logger.info(f"Starting to scrape {url}")
-    response = requests.get(url)
+    response = session.get(url, timeout=REQUEST_TIMEOUT)
     if response.status_code != 200:
         logger.error(f"Failed to retrieve data: {response.status_code}")
         return []
-    soup = BeautifulSoup(response.text, 'html.parser')
-    data = []
-    for item in soup.find_all('div', class_='item'):
-        title = item.find('h2').text
-        link = item.find('a')['href']
-        data.append({'title': title, 'link': link})
+    data = parse_items(response.text)
     logger.info("Scraping completed")
     return data
 
+# Asynchronous scraping engine for many URLs over one pooled client
+class AsyncScraper:
+    def __init__(self, per_host_limit=PER_HOST_LIMIT, total_limit=TOTAL_LIMIT, timeout=REQUEST_TIMEOUT,
+                 retries=MAX_RETRIES, backoff=RETRY_BACKOFF):
+        self.per_host_limit = per_host_limit
+        self.total_limit = total_limit
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.session = None
+        # Concurrency is bounded here rather than by the connector, so time spent waiting for
+        # a slot is not counted against a request's timeout
+        self.total_slots = None
+        self.host_slots = {}
+        # url -> (ETag, Last-Modified, items) from the last full response
+        self.cache = {}
+        self.stats = {'fetched': 0, 'not_modified': 0, 'retries': 0, 'failed': 0}
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.total_limit, limit_per_host=self.per_host_limit)
+        self.session = aiohttp.ClientSession(connector=connector,
+                                             timeout=aiohttp.ClientTimeout(total=self.timeout))
+        self.total_slots = asyncio.Semaphore(self.total_limit)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+
+    def _retry_delay(self, attempt, response_headers=None):
+        retry_after = response_headers.get('Retry-After') if response_headers is not None else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+
+    # One GET once a per-host and a total slot are free; the timeout starts only then
+    async def _get(self, url, headers):
+        host = urlparse(url).netloc
+        host_slots = self.host_slots.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+        async with host_slots, self.total_slots:
+            async with self.session.get(url, headers=headers) as response:
+                html = await response.text() if response.status == 200 else None
+                return response.status, response.headers, html
+
+    # Conditional GET with retries; unchanged pages come back from the cache without being parsed again
+    async def fetch(self, url):
+        etag, last_modified, cached = self.cache.get(url, (None, None, None))
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        for attempt in range(self.retries + 1):
+            try:
+                status, response_headers, html = await self._get(url, headers)
+                if status == 304 and cached is not None:
+                    self.stats['not_modified'] += 1
+                    return cached
+                if status == 200:
+                    data = await asyncio.to_thread(parse_items, html)
+                    self.cache[url] = (response_headers.get('ETag'), response_headers.get('Last-Modified'), data)
+                    self.stats['fetched'] += 1
+                    return data
+                if status not in RETRY_STATUSES or attempt == self.retries:
+                    logger.error(f"Failed to retrieve {url}: {status}")
+                    break
+                delay = self._retry_delay(attempt, response_headers)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == self.retries:
+                    logger.error(f"Failed to retrieve {url}: {e}")
+                    break
+                delay = self._retry_delay(attempt)
+            self.stats['retries'] += 1
+            await asyncio.sleep(delay)
+        self.stats['failed'] += 1
+        return []
+
+    # Scrape every URL concurrently within the per-host and total limits
+    async def scrape_all(self, urls):
+        results = await asyncio.gather(*(self.fetch(url) for url in urls))
+        return dict(zip(urls, results))
+
+# Scrape a list of URLs once with a fresh async engine
+def scrape_many(urls, **options):
+    async def run():
+        async with AsyncScraper(**options) as scraper:
+            return await scraper.scrape_all(urls)
+    return asyncio.run(run())
+
 # Function to save data to a CSV file
 def save_to_csv(data, output_csv):
     with open(output_csv, mode='w', newline='', encoding='utf-8') as file:
@@ -79,13 +193,20 @@ class Watcher(FileSystemEventHandler):
 # Main function
 def main():
     logger.info("Automation script started")
-    while True:
-        try:
-            data = scrape_data(URL)
-            save_to_csv(data, OUTPUT_CSV)
-            time.sleep(CHECK_INTERVAL)
-        except Exception as e:
-            logger.error(f"An error occurred: {str(e)}")
+    asyncio.run(monitor_urls(URLS))
+
+# Scrape the monitored URLs every CHECK_INTERVAL, keeping the pool and validators between cycles
+async def monitor_urls(urls, interval=CHECK_INTERVAL):
+    async with AsyncScraper() as scraper:
+        while True:
+            try:
+                logger.info(f"Starting to scrape {len(urls)} URLs")
+                results = await scraper.scrape_all(urls)
+                save_to_csv([row for data in results.values() for row in data], OUTPUT_CSV)
+                logger.info(f"Scraping completed: {scraper.stats}")
+            except Exception as e:
+                logger.error(f"An error occurred: {str(e)}")
+            await asyncio.sleep(interval)
 
 # File monitoring
 def monitor_directory():
@@ -0,0 +1,100 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from cryptography.fernet import Fernet
+
+from encryption_decryption import (
+    Keyring, bulk_process, decrypt_file_stream, encrypt_file_stream, generate_key, load_key,
+)
+
+# Records per second of a batch run
+def rate(function, count):
+    start = time.perf_counter()
+    function()
+    return count / (time.perf_counter() - start)
+
+# Compare per-record key loading with a keyring for many small records
+def benchmark_records(records=20000, size=100):
+    """Measure records/sec for the old per-call path and the keyring batch APIs"""
+    payloads = [os.urandom(size) for _ in range(records)]
+    keyring = Keyring()
+
+    def per_call():
+        return [Fernet(load_key()).encrypt(payload) for payload in payloads]
+
+    results = {
+        'per_call_encrypt': rate(per_call, records),
+        'encrypt_many': rate(lambda: keyring.encrypt_many(payloads), records),
+    }
+    tokens = keyring.encrypt_many(payloads)
+    results['per_call_decrypt'] = rate(lambda: [Fernet(load_key()).decrypt(token) for token in tokens], records)
+    results['decrypt_many'] = rate(lambda: keyring.decrypt_many(tokens), records)
+    return results
+
+# Streaming file encryption throughput for each worker count
+def benchmark_file(size_mb=256, worker_counts=(1,)):
+    """Measure MB/s of chunked file encryption and decryption"""
+    with open("plain.bin", "wb") as file:
+        for _ in range(size_mb):
+            file.write(os.urandom(1 << 20))
+    results = {}
+    for workers in worker_counts:
+        encrypt = lambda: encrypt_file_stream("plain.bin", "plain.bin.enc", workers=workers)
+        decrypt = lambda: decrypt_file_stream("plain.bin.enc", "plain.out", workers=workers)
+        results[f'encrypt_file[{workers}]'] = rate(encrypt, size_mb)
+        results[f'decrypt_file[{workers}]'] = rate(decrypt, size_mb)
+    return results
+
+# Bulk directory encryption: a cold run, then a rerun where only a tenth of the files changed
+def benchmark_bulk(files=500, size=64 * 1024, workers=None):
+    """Measure files/sec and bytes/sec of bulk encryption, cold and incremental"""
+    for i in range(files):
+        os.makedirs(os.path.join("tree", str(i % 10)), exist_ok=True)
+        with open(os.path.join("tree", str(i % 10), f"{i}.bin"), "wb") as file:
+            file.write(os.urandom(size))
+    cold = bulk_process("tree", "encrypt", workers=workers)
+    for i in range(0, files, 10):
+        with open(os.path.join("tree", str(i % 10), f"{i}.bin"), "ab") as file:
+            file.write(b"changed")
+    rerun = bulk_process("tree", "encrypt", workers=workers)
+    return {
+        'bulk_cold_files': cold['files_per_sec'],
+        'bulk_cold_mb': cold['bytes_per_sec'] / 1e6,
+        'bulk_rerun_seconds': rerun['seconds'],
+        'bulk_rerun_processed': rerun['processed'],
+    }
+
+# Main function
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark encryption_decryption")
+    parser.add_argument('--records', type=int, default=20000)
+    parser.add_argument('--size', type=int, default=100, help="bytes per record")
+    parser.add_argument('--file-mb', type=int, default=256, help="size of the streaming test file")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    parser.add_argument('--bulk-files', type=int, default=500, help="files in the bulk test tree")
+    args = parser.parse_args(argv)
+
+    # Work in a scratch directory so the real secret.key is never touched
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as folder:
+        os.chdir(folder)
+        try:
+            generate_key()
+            results = benchmark_records(args.records, args.size)
+            file_results = benchmark_file(args.file_mb, sorted(set(args.workers)))
+            bulk_results = benchmark_bulk(args.bulk_files, workers=max(args.workers))
+        finally:
+            os.chdir(previous)
+    for name, records_per_sec in results.items():
+        print(f"{name:<18} {records_per_sec:>12.0f} records/s")
+    for name, mb_per_sec in file_results.items():
+        print(f"{name:<18} {mb_per_sec:>12.1f} MB/s")
+    print(f"bulk cold          {bulk_results['bulk_cold_files']:>12.1f} files/s {bulk_results['bulk_cold_mb']:.1f} MB/s")
+    print(f"bulk rerun         {bulk_results['bulk_rerun_seconds']:>12.3f} s for "
+          f"{bulk_results['bulk_rerun_processed']} changed files")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
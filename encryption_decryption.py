@@ -1,5 +1,20 @@
 import os
-from cryptography.fernet import Fernet
+import time
+import mmap
+import base64
+import struct
+import hashlib
+import json
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet, MultiFernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+KEY_FILE = "secret.key"
 
 # Generate a key for encryption and decryption
 def generate_key():
@@ -8,26 +23,130 @@ def generate_key():
     with open("secret.key", "wb") as key_file:
         key_file.write(key)
         
+# Load every key in the key file, newest first
+def load_keys(path=KEY_FILE):
+    """Load all keys from the key file; the first one is the primary key"""
+    with open(path, "rb") as key_file:
+        return [line.strip() for line in key_file if line.strip()]
+
 # Load the previously generated key
 def load_key():
     """Load the key from the current directory named 'secret.key'"""
-    return open("secret.key", "rb").read()
+    return load_keys()[0]
+
+# Rotate in a new primary key
+def rotate_key(path=KEY_FILE):
+    """Prepend a freshly generated key to the key file; older keys stay valid for decryption"""
+    keys = [Fernet.generate_key()] + (load_keys(path) if os.path.exists(path) else [])
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as key_file:
+        key_file.write(b"\n".join(keys) + b"\n")
+    os.replace(temp_path, path)
+    # This process switches to the new key at once rather than at its keyring's next check
+    keyring = _keyrings.get(os.path.abspath(path))
+    if keyring is not None:
+        keyring.reload()
+    return keys[0]
+
+# Keys loaded once, with ready-to-use ciphers
+class Keyring:
+    """Cache the ciphers for a key file and reload them when the file changes"""
+
+    def __init__(self, path=KEY_FILE, check_interval=1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.ciphers = {}
+        self.signature = None
+        self.next_check = 0.0
+        self.lock = threading.Lock()
+        self.refresh()
+
+    def _reload(self):
+        """Rebuild the ciphers if the key file was replaced or rewritten"""
+        stat = os.stat(self.path)
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if signature == self.signature:
+            return
+        keys = load_keys(self.path)
+        ciphers = [self.ciphers.get(key) or Fernet(key) for key in keys]
+        self.keys = keys
+        self.ciphers = dict(zip(keys, ciphers))
+        self.primary = ciphers[0]
+        self.multi = MultiFernet(ciphers)
+        self.signature = signature
+
+    def refresh(self):
+        """Look at the key file at most once per check interval"""
+        now = time.monotonic()
+        if now >= self.next_check:
+            with self.lock:
+                if now >= self.next_check:
+                    self._reload()
+                    self.next_check = now + self.check_interval
+
+    def reload(self):
+        """Look at the key file now, whatever the check interval"""
+        with self.lock:
+            self._reload()
+            self.next_check = time.monotonic() + self.check_interval
+
+    def encrypt(self, data):
+        """Encrypt bytes with the primary key"""
+        self.refresh()
+        return self.primary.encrypt(data)
+
+    def decrypt(self, token):
+        """Decrypt a token made with any key in the key file"""
+        self.refresh()
+        return self.multi.decrypt(token)
+
+    def rotate(self, token):
+        """Re-encrypt a token under the primary key"""
+        self.refresh()
+        return self.multi.rotate(token)
+
+    def encrypt_many(self, records):
+        """Encrypt a batch of records (str or bytes)"""
+        self.refresh()
+        encrypt = self.primary.encrypt
+        return [encrypt(record.encode() if isinstance(record, str) else record) for record in records]
+
+    def decrypt_many(self, tokens):
+        """Decrypt a batch of tokens to bytes"""
+        self.refresh()
+        decrypt = self.multi.decrypt
+        return [decrypt(token) for token in tokens]
+
+    def rotate_many(self, tokens):
+        """Re-encrypt a batch of tokens under the primary key"""
+        self.refresh()
+        rotate = self.multi.rotate
+        return [rotate(token) for token in tokens]
+
+_keyrings = {}
+_keyrings_lock = threading.Lock()
+
+# Shared keyring per key file
+def get_keyring(path=KEY_FILE):
+    """Return the keyring for a key file, creating it on first use"""
+    path = os.path.abspath(path)
+    keyring = _keyrings.get(path)
+    if keyring is None:
+        with _keyrings_lock:
+            keyring = _keyrings.get(path)
+            if keyring is None:
+                keyring = _keyrings[path] = Keyring(path)
+    return keyring
 
 # Encrypt the data
 def encrypt_data(data):
     """Encrypt the data using the loaded key"""
-    key = load_key()
-    f = Fernet(key)
-    encrypted_data = f.encrypt(data.encode())
-    return encrypted_data
+    return get_keyring().encrypt(data.encode())
 
 # Decrypt the data
 def decrypt_data(encrypted_data):
     """Decrypt the data using the loaded key"""
-    key = load_key()
-    f = Fernet(key)
-    decrypted_data = f.decrypt(encrypted_data).decode()
-    return decrypted_data
+    return get_keyring().decrypt(encrypted_data).decode()
 
 # Save encrypted data to a file
 def save_encrypted_file(filename, data):
@@ -77,21 +196,287 @@ def list_available_files():
     """List all files in the current directory that can be encrypted or decrypted"""
     return [f for f in os.listdir() if os.path.isfile(f) and not f.endswith('.key')]
 
+# Streaming file format: a header, then one AES-GCM frame per fixed-size chunk.
+# Each chunk's nonce is its sequence number plus a last-chunk flag, and the header is authenticated
+# with every chunk, so reordered, dropped, truncated or spliced chunks all fail to decrypt.
+STREAM_MAGIC = b"FENCSTR1"
+STREAM_HEADER = struct.Struct(">8sI16s8s")  # magic, chunk size, salt, key id
+FRAME_LENGTH = struct.Struct(">I")
+TAG_SIZE = 16
+STREAM_CHUNK_SIZE = 1 << 20
+CHUNKS_PER_TASK = 8
+
+# Short fingerprint naming the key a file was encrypted with
+def key_id(key):
+    """Return an 8-byte identifier for a Fernet key"""
+    return hashlib.sha256(b"stream key id" + key).digest()[:8]
+
+# Per-file AES-256-GCM key derived from the Fernet key and the file's random salt
+def stream_key(key, salt):
+    """Derive the chunk encryption key for one file"""
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=salt, info=b"encryption_decryption stream v1")
+    return hkdf.derive(base64.urlsafe_b64decode(key))
+
+def chunk_nonce(sequence, last):
+    """Nonce for a chunk: 11-byte sequence number and a last-chunk flag"""
+    return sequence.to_bytes(11, "big") + (b"\x01" if last else b"\x00")
+
+def _map_file(path):
+    """Memory-map a file for reading; empty files map to an empty bytes object"""
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+# Worker task: encrypt chunks [first, last) of the input, read through mmap
+def _encrypt_chunks(path, aead_key, header, chunk_size, first, last, total):
+    """Encrypt a run of chunks and return their frames"""
+    aead = AESGCM(aead_key)
+    data = _map_file(path)
+    try:
+        frames = []
+        for sequence in range(first, last):
+            plaintext = data[sequence * chunk_size:(sequence + 1) * chunk_size]
+            ciphertext = aead.encrypt(chunk_nonce(sequence, sequence == total - 1), plaintext, header)
+            frames.append(FRAME_LENGTH.pack(len(ciphertext)) + ciphertext)
+        return b"".join(frames)
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+# Worker task: decrypt chunks [first, last) of an encrypted file
+def _decrypt_chunks(path, aead_key, header, chunk_size, first, last, total):
+    """Decrypt a run of frames and return the plaintext"""
+    aead = AESGCM(aead_key)
+    data = _map_file(path)
+    frame_size = FRAME_LENGTH.size + chunk_size + TAG_SIZE
+    try:
+        parts = []
+        for sequence in range(first, last):
+            offset = STREAM_HEADER.size + sequence * frame_size
+            if offset + FRAME_LENGTH.size > len(data):
+                raise InvalidToken(f"File is truncated at chunk {sequence}")
+            (length,) = FRAME_LENGTH.unpack_from(data, offset)
+            is_last = sequence == total - 1
+            end = offset + FRAME_LENGTH.size + length
+            if length > chunk_size + TAG_SIZE or (length != chunk_size + TAG_SIZE and not is_last) \
+                    or (is_last and end != len(data)):
+                raise InvalidToken(f"Corrupt frame at chunk {sequence}")
+            try:
+                parts.append(aead.decrypt(chunk_nonce(sequence, is_last), data[offset + FRAME_LENGTH.size:end],
+                                          header))
+            except InvalidTag:
+                raise InvalidToken(f"Chunk {sequence} failed authentication") from None
+        return b"".join(parts)
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+# Run chunk tasks on a pool and write their output in order, keeping only a few tasks in flight
+def _run_chunk_tasks(task, args, total, out_path, prefix=b"", workers=None, executor="process"):
+    """Run task over all chunks and write the results to out_path atomically"""
+    temp_path = out_path + ".part"
+    tasks = [(first, min(first + CHUNKS_PER_TASK, total)) for first in range(0, total, CHUNKS_PER_TASK)]
+    # A pool only pays off with more than one task; small files are done before it would have started
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks)))
+    try:
+        with open(temp_path, "wb") as output:
+            output.write(prefix)
+            if workers == 1:
+                for first, last in tasks:
+                    output.write(task(*args, first, last, total))
+            else:
+                pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+                with pool_cls(max_workers=workers) as pool:
+                    pending = deque()
+                    for first, last in tasks:
+                        pending.append(pool.submit(task, *args, first, last, total))
+                        if len(pending) >= 2 * workers:
+                            output.write(pending.popleft().result())
+                    while pending:
+                        output.write(pending.popleft().result())
+        os.replace(temp_path, out_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def encrypt_file_stream(in_path, out_path, keyring=None, chunk_size=STREAM_CHUNK_SIZE, workers=None,
+                        executor="process"):
+    """Encrypt a file of any size in authenticated chunks, in parallel and with bounded memory"""
+    keyring = keyring or get_keyring()
+    keyring.refresh()
+    key = keyring.keys[0]
+    salt = os.urandom(16)
+    header = STREAM_HEADER.pack(STREAM_MAGIC, chunk_size, salt, key_id(key))
+    total = max(1, -(-os.path.getsize(in_path) // chunk_size))
+    _run_chunk_tasks(_encrypt_chunks, (in_path, stream_key(key, salt), header, chunk_size), total, out_path,
+                     prefix=header, workers=workers, executor=executor)
+
+def read_stream_header(path):
+    """Return the stream header of an encrypted file, or None for other files"""
+    with open(path, "rb") as file:
+        header = file.read(STREAM_HEADER.size)
+    if len(header) < STREAM_HEADER.size or not header.startswith(STREAM_MAGIC):
+        return None
+    return header
+
+def decrypt_file_stream(in_path, out_path, keyring=None, workers=None, executor="process"):
+    """Decrypt a chunked file, checking every chunk before the output replaces out_path"""
+    keyring = keyring or get_keyring()
+    keyring.refresh()
+    header = read_stream_header(in_path)
+    if header is None:
+        raise InvalidToken("Not a chunked encrypted file")
+    _, chunk_size, salt, file_key_id = STREAM_HEADER.unpack(header)
+    key = next((key for key in keyring.keys if key_id(key) == file_key_id), None)
+    if key is None:
+        raise InvalidToken("File was encrypted with a key that is not in the key file")
+    frame_size = FRAME_LENGTH.size + chunk_size + TAG_SIZE
+    total = max(1, -(-(os.path.getsize(in_path) - STREAM_HEADER.size) // frame_size))
+    _run_chunk_tasks(_decrypt_chunks, (in_path, stream_key(key, salt), header, chunk_size), total, out_path,
+                     workers=workers, executor=executor)
+
+def decrypted_path(file_path):
+    """Output name for a decrypted file: the path without its .enc suffix"""
+    return file_path[:-len(".enc")] if file_path.endswith(".enc") else file_path + ".dec"
+
 def encrypt_file(file_path):
     """Encrypt the contents of a file"""
-    with open(file_path, "r") as file:
-        file_data = file.read()
-    encrypted_data = encrypt_data(file_data)
-    save_encrypted_file(file_path + ".enc", encrypted_data)
+    encrypt_file_stream(file_path, file_path + ".enc")
     print(f"File '{file_path}' encrypted and saved as '{file_path}.enc'")
 
+def decrypt_to(file_path, output_path, keyring=None, workers=None):
+    """Decrypt a chunked or a legacy single-token file to output_path"""
+    keyring = keyring or get_keyring()
+    if read_stream_header(file_path) is not None:
+        decrypt_file_stream(file_path, output_path, keyring, workers=workers)
+    else:
+        # Files written before the chunked format are a single Fernet token
+        save_encrypted_file(output_path, keyring.decrypt(read_encrypted_file(file_path)))
+
 def decrypt_file(file_path):
     """Decrypt the contents of an encrypted file"""
-    encrypted_data = read_encrypted_file(file_path)
-    decrypted_data = decrypt_data(encrypted_data)
-    with open(file_path.replace(".enc", ""), "w") as file:
-        file.write(decrypted_data)
-    print(f"File '{file_path}' decrypted and saved as '{file_path.replace('.enc', '')}'")
+    output_path = decrypted_path(file_path)
+    decrypt_to(file_path, output_path)
+    print(f"File '{file_path}' decrypted and saved as '{output_path}'")
+
+MANIFEST_NAME = ".encryption_manifest.json"
+SKIPPED_SUFFIXES = (".key", ".part", ".tmp")
+
+# Files under a directory tree that a bulk run should look at
+def iter_bulk_files(root, mode):
+    """Yield paths to encrypt (anything but .enc files) or to decrypt (.enc files)"""
+    for directory, _, files in os.walk(root):
+        for name in files:
+            if name == MANIFEST_NAME or name.endswith(SKIPPED_SUFFIXES):
+                continue
+            if (mode == "decrypt") == name.endswith(".enc"):
+                yield os.path.join(directory, name)
+
+def file_sha256(path):
+    """Content hash of a file, read in blocks"""
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+def load_manifest(path):
+    """Load a bulk manifest, or start an empty one"""
+    if not os.path.exists(path):
+        return {"encrypt": {}, "decrypt": {}}
+    with open(path) as file:
+        return json.load(file)
+
+def save_manifest(manifest, path):
+    """Write the manifest atomically"""
+    with open(path + ".tmp", "w") as file:
+        json.dump(manifest, file)
+    os.replace(path + ".tmp", path)
+
+# Worker task for one file; hashing happens here too, so only changed files are ever read in the parent
+def _bulk_task(mode, key_path, path, output_path, known):
+    """Encrypt or decrypt one file unless its content and key are unchanged"""
+    try:
+        stat = os.stat(path)
+        digest = file_sha256(path)
+        keyring = get_keyring(key_path)
+        keyring.refresh()
+        # Re-encrypt after a key rotation; decrypted output does not depend on the primary key
+        primary = key_id(keyring.keys[0]).hex() if mode == "encrypt" else None
+        entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest, "key_id": primary}
+        if known and known.get("sha256") == digest and known.get("key_id") == primary and os.path.exists(output_path):
+            return path, entry, "skipped", None
+        if mode == "encrypt":
+            encrypt_file_stream(path, output_path, keyring, workers=1)
+        else:
+            decrypt_to(path, output_path, keyring, workers=1)
+        return path, entry, "processed", None
+    except Exception as e:
+        return path, None, "failed", f"{type(e).__name__}: {e}"
+
+def bulk_process(root, mode="encrypt", workers=None, manifest_path=None, key_path=KEY_FILE):
+    """Encrypt or decrypt every file under root on a process pool, skipping files unchanged since the last run"""
+    if mode not in ("encrypt", "decrypt"):
+        raise ValueError(f"Unknown mode: {mode}")
+    workers = workers or os.cpu_count() or 1
+    key_path = os.path.abspath(key_path)
+    manifest_path = manifest_path or os.path.join(root, MANIFEST_NAME)
+    manifest = load_manifest(manifest_path)
+    entries = manifest.setdefault(mode, {})
+    keyring = get_keyring(key_path)
+    keyring.refresh()
+    primary = key_id(keyring.keys[0]).hex() if mode == "encrypt" else None
+    report = {"processed": 0, "skipped": 0, "failed": 0, "bytes": 0, "errors": {}}
+
+    def record(path, entry, status, error):
+        report[status] += 1
+        if status == "failed":
+            report["errors"][path] = error
+            return
+        entries[os.path.relpath(path, root)] = entry
+        if status == "processed":
+            report["bytes"] += entry["size"]
+
+    start = time.perf_counter()
+    tasks = []
+    for path in iter_bulk_files(root, mode):
+        output_path = path + ".enc" if mode == "encrypt" else decrypted_path(path)
+        known = entries.get(os.path.relpath(path, root))
+        stat = os.stat(path)
+        # Same size, mtime and key as last time: skip without reading the file
+        if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns \
+                and known.get("key_id") == primary and os.path.exists(output_path):
+            report["skipped"] += 1
+            continue
+        tasks.append((mode, key_path, path, output_path, known))
+    workers = max(1, min(workers, len(tasks)))
+
+    try:
+        if workers == 1:
+            for task in tasks:
+                record(*_bulk_task(*task))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = set()
+                for task in tasks:
+                    pending.add(pool.submit(_bulk_task, *task))
+                    if len(pending) >= 4 * workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            record(*future.result())
+                for future in pending:
+                    record(*future.result())
+    finally:
+        save_manifest(manifest, manifest_path)
+
+    elapsed = time.perf_counter() - start
+    report["seconds"] = elapsed
+    report["files_per_sec"] = report["processed"] / elapsed if elapsed else 0.0
+    report["bytes_per_sec"] = report["bytes"] / elapsed if elapsed else 0.0
+    print(f"{mode}: {report['processed']} processed, {report['skipped']} skipped, {report['failed']} failed "
+          f"in {elapsed:.2f}s ({report['files_per_sec']:.1f} files/s, {report['bytes_per_sec'] / 1e6:.1f} MB/s)")
+    for path, error in report["errors"].items():
+        print(f"  {path}: {error}")
+    return report
 
 def main_menu():
     """Display the main menu for file encryption and decryption operations"""
@@ -100,7 +485,9 @@ def main_menu():
         print("1. Encrypt a file")
         print("2. Decrypt a file")
         print("3. List available files")
-        print("4. Exit")
+        print("4. Bulk encrypt a directory")
+        print("5. Bulk decrypt a directory")
+        print("6. Exit")
         choice = input("Choose an option: ")
 
         if choice == '1':
@@ -118,7 +505,13 @@ def main_menu():
         elif choice == '3':
             files = list_available_files()
             print("Available files:", files)
-        elif choice == '4':
+        elif choice in ('4', '5'):
+            directory = input("Enter the directory: ")
+            if os.path.isdir(directory):
+                bulk_process(directory, "encrypt" if choice == '4' else "decrypt")
+            else:
+                print("Directory not found.")
+        elif choice == '6':
             print("Exiting the program.")
             break
         else:
@@ -0,0 +1,188 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List
+
+from fuzz_tester import (
+    CommandFuzzer, FileFuzzer, FuzzTester, ParallelRunner, RandomJsonFuzzer, TimeoutFuzzTester,
+    command_input_generator, save_command_results,
+)
+
+
+# Scales are case counts; process-per-input fuzzers get smaller ones.
+SCALES = {
+    'FuzzTester': [1000, 10000, 100000],
+    'CommandFuzzer': [50, 200],
+    'FileFuzzer': [1000, 10000, 100000],
+    'RandomJsonFuzzer': [1000, 10000, 100000],
+    'TimeoutFuzzTester': [200, 1000],
+}
+
+JSON_STRUCTURE = {
+    'name': ['Alice', 'Bob', None, '', 123, 'Charlie'],
+    'age': [22, None, 'twenty', 5],
+    'city': ['New York', 'London', None, '', 'Tokyo'],
+}
+
+
+def synthetic_target(input_data: Any) -> str:
+    text = input_data if isinstance(input_data, str) else json.dumps(input_data, default=str)
+    checksum = sum(map(ord, text)) & 0xFF
+    if checksum < 8:
+        raise ValueError(f"Synthetic failure {checksum}")
+    return f"Processed: {checksum}"
+
+
+class StageTimer:
+    def __init__(self):
+        self.stages = {}
+
+    def time(self, stage: str, function: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        result = function()
+        self.stages[stage] = self.stages.get(stage, 0.0) + time.perf_counter() - start
+        return result
+
+
+def _bench_fuzz_tester(cases: int, timer: StageTimer, output: str) -> None:
+    tester = FuzzTester(synthetic_target)
+    timer.time('generation', lambda: tester.generate_test_cases(cases))
+    results = timer.time('execution', tester.run_tests)
+    timer.time('serialization', lambda: tester.save_results(results, output))
+
+
+def _bench_command_fuzzer(cases: int, timer: StageTimer, output: str) -> None:
+    inputs = timer.time('generation', lambda: [command_input_generator() for _ in range(cases)])
+    fuzzer = CommandFuzzer('echo', iter(inputs).__next__, cases)
+    results = timer.time('execution', fuzzer.fuzz)
+    timer.time('serialization', lambda: save_command_results(results, output))
+
+
+def _bench_file_fuzzer(cases: int, timer: StageTimer, output: str) -> None:
+    corpus = output + '.corpus'
+    tester = FuzzTester(synthetic_target)
+
+    def write_corpus() -> None:
+        with open(corpus, 'w') as f:
+            for case in tester.iter_test_cases(cases):
+                f.write(case.replace('\n', ' ') + '\n')
+
+    timer.time('generation', write_corpus)
+    try:
+        results = timer.time('execution', FileFuzzer(synthetic_target, corpus).fuzz_file)
+    finally:
+        os.remove(corpus)
+    timer.time('serialization', lambda: save_command_results(results, output))
+
+
+def _bench_random_json_fuzzer(cases: int, timer: StageTimer, output: str) -> None:
+    fuzzer = RandomJsonFuzzer(synthetic_target, JSON_STRUCTURE, cases)
+    inputs = timer.time('generation', lambda: list(fuzzer.iter_random_json()))
+    results = timer.time('execution', lambda: list(ParallelRunner().run(fuzzer.case_runner(), inputs)))
+    timer.time('serialization', lambda: save_command_results(results, output))
+
+
+def _bench_timeout_fuzz_tester(cases: int, timer: StageTimer, output: str) -> None:
+    tester = TimeoutFuzzTester(synthetic_target, 100, timeout=0.5)
+    timer.time('generation', lambda: tester.generate_test_cases(cases))
+    results = timer.time('execution', tester.run_tests)
+    timer.time('serialization', lambda: tester.save_results(results, output))
+
+
+BENCHMARKS = {
+    'FuzzTester': _bench_fuzz_tester,
+    'CommandFuzzer': _bench_command_fuzzer,
+    'FileFuzzer': _bench_file_fuzzer,
+    'RandomJsonFuzzer': _bench_random_json_fuzzer,
+    'TimeoutFuzzTester': _bench_timeout_fuzz_tester,
+}
+
+
+def run_benchmark(name: str, cases: int) -> Dict[str, Any]:
+    # Spawned children inherit 'spawn' as their start method; the fuzzers' own pools should
+    # run under the platform default, as they would outside the benchmark.
+    multiprocessing.set_start_method(multiprocessing.get_all_start_methods()[0], force=True)
+    timer = StageTimer()
+    fd, output = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    try:
+        BENCHMARKS[name](cases, timer, output)
+    finally:
+        os.remove(output)
+    return {
+        'cases': cases,
+        'execs_per_sec': cases / timer.stages['execution'],
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'stages': timer.stages,
+    }
+
+
+def run_suite(names: List[str], scale: float = 1.0) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    # A fresh spawned interpreter per benchmark keeps ru_maxrss a per-benchmark peak.
+    context = multiprocessing.get_context('spawn')
+    for name in names:
+        for cases in SCALES[name]:
+            cases = max(1, int(cases * scale))
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                result = pool.submit(run_benchmark, name, cases).result()
+            key = f"{name}[{cases}]"
+            results[key] = result
+            print(f"{key:<28} {result['execs_per_sec']:>12.0f} execs/s {result['peak_rss_kb'] / 1024:>8.1f} MiB  "
+                  + '  '.join(f"{stage}={seconds:.3f}s" for stage, seconds in result['stages'].items()))
+    return results
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+                        tolerance: float) -> List[str]:
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        expected = baseline[key]
+        if result['execs_per_sec'] < expected['execs_per_sec'] * (1 - tolerance):
+            regressions.append(f"{key}: {result['execs_per_sec']:.0f} execs/s vs baseline "
+                               f"{expected['execs_per_sec']:.0f}")
+        if result['peak_rss_kb'] > expected['peak_rss_kb'] * (1 + tolerance):
+            regressions.append(f"{key}: peak RSS {result['peak_rss_kb']} KiB vs baseline {expected['peak_rss_kb']} KiB")
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the fuzzers in fuzz_tester.py")
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument('--scale', type=float, default=1.0, help="multiply every case count by this factor")
+    parser.add_argument('--output', default='fuzz_benchmark_results.json')
+    parser.add_argument('--baseline', help="results file to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="allowed relative slowdown or RSS growth")
+    parser.add_argument('--save-baseline', action='store_true', help="also write the results to --baseline")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.only, args.scale)
+    report = {'python': platform.python_version(), 'machine': platform.machine(), 'benchmarks': results}
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=4)
+
+    if args.baseline and args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=4)
+        return 0
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)['benchmarks']
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
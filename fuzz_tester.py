@@ -1,42 +1,518 @@
 import random
 import string
 import json
+import mmap
+import pickle
 import tempfile
 import subprocess
 import os
 import time
-from typing import Any, Callable, List, Dict
+import asyncio
+import signal
+import multiprocessing
+import queue
+import threading
+import functools
+import hashlib
+import re
+import traceback
+import inspect
+import sys
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterable, Iterator, List, Dict, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # only needed for the batched generators
+    np = None
+
+
+FUZZ_CHARSET = string.ascii_letters + string.digits + string.punctuation
+COMMAND_CHARSET = string.ascii_letters + string.digits + ' '
+
+
+def run_case(target_function: Callable[[Any], Any], case: Any) -> Dict[str, Any]:
+    try:
+        return {'input': case, 'output': target_function(case), 'error': None}
+    except Exception as e:
+        return {'input': case, 'output': None, 'error': str(e), 'error_type': type(e).__name__,
+                'crash_site': crash_site(e.__traceback__.tb_next)}
+
+
+def crash_site(tb, depth: int = 3) -> str:
+    # Code names and line numbers only; formatting a full traceback reads source files.
+    frames = [f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}:{lineno}"
+              for frame, lineno in traceback.walk_tb(tb)]
+    return ' < '.join(reversed(frames[-depth:]))
+
+
+_worker_runner = None
+
+
+def _init_worker(runner: Callable[[Any], Dict[str, Any]]) -> None:
+    # Ship the case runner once per worker process instead of once per chunk.
+    global _worker_runner
+    _worker_runner = runner
+
+
+def _run_chunk(chunk: List[Any], runner: Callable[[Any], Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    runner = runner or _worker_runner
+    return [runner(case) for case in chunk]
+
+
+def _run_chunk_pickled(chunk: List[Any]) -> bytes:
+    # Pickled here so an output that cannot cross the process boundary (a generator, a lock)
+    # is sent back as its repr instead of failing the chunk after the target already ran.
+    results = _run_chunk(chunk)
+    try:
+        return pickle.dumps(results, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        for result in results:
+            try:
+                pickle.dumps(result['output'], protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                result['output'] = repr(result['output'])
+        return pickle.dumps(results, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _chunk_failed(chunk: List[Any], error: Exception) -> List[Dict[str, Any]]:
+    return [{'input': case, 'output': None, 'error': f"Could not run in a worker: {error!r}",
+             'error_type': 'WorkerError'} for case in chunk]
+
+
+class ParallelRunner:
+    def __init__(self, workers: int = 1, executor: str = 'process', chunk_size: int = 64):
+        if executor not in ('process', 'thread'):
+            raise ValueError(f"Unknown executor: {executor}")
+        self.workers = max(1, workers)
+        self.executor = executor
+        self.chunk_size = max(1, chunk_size)
+        self._kept = None
+
+    @contextmanager
+    def keep_pool(self, runner: Callable[[Any], Dict[str, Any]]) -> Iterator[None]:
+        # Calls to run() with this runner inside the block share one pool instead of starting their own.
+        if self.workers == 1 or (self._kept is not None and self._kept[0] is runner):
+            yield
+            return
+        self._kept = (runner, self._make_pool(runner))
+        try:
+            yield
+        finally:
+            _, pool = self._kept
+            self._kept = None
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _acquire_pool(self, runner: Callable[[Any], Dict[str, Any]]):
+        if self._kept is not None and self._kept[0] is runner:
+            return self._kept[1]
+        return self._make_pool(runner)
+
+    def _replace_pool(self, runner: Callable[[Any], Dict[str, Any]], pool):
+        # A dead worker breaks the whole pool; later calls must not pick up the broken one.
+        pool.shutdown(wait=False, cancel_futures=True)
+        replacement = self._make_pool(runner)
+        if self._kept is not None and self._kept[1] is pool:
+            self._kept = (runner, replacement)
+        return replacement
+
+    def _release_pool(self, pool, pending) -> None:
+        if self._kept is not None and self._kept[1] is pool:
+            for _, future in pending:
+                if future is not None:
+                    future.cancel()
+            return
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    def _chunks(self, cases: Iterable[Any]) -> Iterator[List[Any]]:
+        chunk = []
+        for case in cases:
+            chunk.append(case)
+            if len(chunk) == self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _make_pool(self, runner: Callable[[Any], Dict[str, Any]]):
+        if self.executor == 'thread':
+            return ThreadPoolExecutor(max_workers=self.workers)
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(runner,))
+
+    def _submit(self, pool, runner: Callable[[Any], Dict[str, Any]], chunk: List[Any]):
+        if self.executor == 'thread':
+            return pool.submit(_run_chunk, chunk, runner)
+        return pool.submit(_run_chunk_pickled, chunk)
+
+    def _results(self, future) -> List[Dict[str, Any]]:
+        results = future.result()
+        return pickle.loads(results) if self.executor == 'process' else results
+
+    def run(self, runner: Callable[[Any], Dict[str, Any]], cases: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+        if self.workers == 1:
+            for case in cases:
+                yield runner(case)
+            return
+
+        chunks = self._chunks(cases)
+        pool = self._acquire_pool(runner)
+        pending = deque()
+        try:
+            while True:
+                # Keep a bounded window of chunks in flight; results come back in input order.
+                while len(pending) < self.workers * 2:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    try:
+                        pending.append((chunk, self._submit(pool, runner, chunk)))
+                    except BrokenProcessPool:
+                        # A worker died while chunks were still being queued.
+                        pending.append((chunk, None))
+                        break
+                if not pending:
+                    break
+
+                chunk, future = pending.popleft()
+                try:
+                    if future is None:
+                        raise BrokenProcessPool("The pool broke before this chunk was submitted")
+                    results = self._results(future)
+                except BrokenProcessPool:
+                    # A dead worker poisons every in-flight future, so rerun them in isolation.
+                    pool = self._replace_pool(runner, pool)
+                    failed = [(chunk, future)] + list(pending)
+                    pending.clear()
+                    yield from self._recover(runner, failed)
+                    continue
+                except Exception as e:
+                    # e.g. an input that cannot be pickled to the worker; the target never runs in the parent
+                    results = _chunk_failed(chunk, e)
+                yield from results
+        finally:
+            self._release_pool(pool, pending)
+
+    def _recover(self, runner: Callable[[Any], Dict[str, Any]], failed: List[Any]) -> Iterator[Dict[str, Any]]:
+        with ThreadPoolExecutor(max_workers=self.workers) as rescue:
+            retries = []
+            for chunk, future in failed:
+                if future is not None and future.done() and not future.cancelled() and future.exception() is None:
+                    retries.append(rescue.submit(self._results, future))
+                else:
+                    retries.append(rescue.submit(self._run_isolated, runner, chunk))
+            for future in retries:
+                yield from future.result()
+
+    def _run_isolated(self, runner: Callable[[Any], Dict[str, Any]], chunk: List[Any]) -> List[Dict[str, Any]]:
+        try:
+            with ProcessPoolExecutor(max_workers=1, initializer=_init_worker, initargs=(runner,)) as pool:
+                return pickle.loads(pool.submit(_run_chunk_pickled, chunk).result())
+        except BrokenProcessPool as e:
+            if len(chunk) == 1:
+                return [{'input': chunk[0], 'output': None, 'error': f"Worker crashed: {e}", 'error_type': 'WorkerCrash'}]
+            middle = len(chunk) // 2
+            return self._run_isolated(runner, chunk[:middle]) + self._run_isolated(runner, chunk[middle:])
+        except Exception as e:
+            return _chunk_failed(chunk, e)
+
+
+class BatchStringGenerator:
+    def __init__(self, charset: str, min_length: int, max_length: int, seed: Optional[int] = None,
+                 batch_size: int = 4096):
+        if np is None:
+            raise ImportError("BatchStringGenerator requires numpy")
+        codes = np.array([ord(c) for c in charset], dtype=np.uint32)
+        ascii_only = int(codes.max()) < 128
+        self.charset = codes.astype(np.uint8) if ascii_only else codes
+        self.encoding = 'ascii' if ascii_only else 'utf-32-le'
+        self.min_length = min_length
+        self.max_length = max_length
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+        self._buffer = np.empty(batch_size * max_length, dtype=self.charset.dtype)
+        self._pending = []
+        self._skip = 0
+        self._resume = None
+
+    def generate_batch(self, size: Optional[int] = None) -> List[str]:
+        size = size or self.batch_size
+        lengths = self.rng.integers(self.min_length, self.max_length + 1, size=size)
+        ends = np.cumsum(lengths)
+        total = int(ends[-1])
+        if total > self._buffer.size:
+            self._buffer = np.empty(total, dtype=self.charset.dtype)
+        chars = self._buffer[:total]
+        np.take(self.charset, self.rng.integers(0, self.charset.size, size=total), out=chars)
+        # Decode the whole batch once and slice it, instead of one join per string.
+        text = chars.tobytes().decode(self.encoding)
+        return [text[start:end] for start, end in zip((ends - lengths).tolist(), ends.tolist())]
+
+    def iter_strings(self, count: int) -> Iterator[str]:
+        # Always draw full batches so a seed yields the same prefix whatever the count.
+        while count > 0:
+            state = self.rng.bit_generator.state
+            batch = self.generate_batch()
+            start, self._skip = self._skip, 0
+            stop = min(len(batch), start + count)
+            for offset in range(start, stop):
+                self._resume = (state, offset + 1)
+                yield batch[offset]
+            count -= stop - start
+
+    def get_state(self):
+        # The state a batch was drawn from plus how far into it iter_strings got.
+        return self._resume or (self.rng.bit_generator.state, 0)
+
+    def set_state(self, state) -> None:
+        self.rng.bit_generator.state, self._skip = state
+        self._resume = None
+
+    def __call__(self) -> str:
+        if not self._pending:
+            self._pending = self.generate_batch()
+            self._pending.reverse()
+        return self._pending.pop()
 
 
 class FuzzTester:
-    def __init__(self, target_function: Callable[[Any], Any], max_length: int = 100):
+    def __init__(self, target_function: Callable[[Any], Any], max_length: int = 100,
+                 seed: Optional[int] = None, batch_size: int = 0):
         self.target_function = target_function
         self.max_length = max_length
         self.test_cases = []
+        self.generator = BatchStringGenerator(FUZZ_CHARSET, 1, max_length, seed, batch_size) if batch_size else None
+        self.rng = random.Random(seed)
     
     def generate_random_string(self) -> str:
-        length = random.randint(1, self.max_length)
-        return ''.join(random.choices(string.ascii_letters + string.digits + string.punctuation, k=length))
+        length = self.rng.randint(1, self.max_length)
+        return ''.join(self.rng.choices(FUZZ_CHARSET, k=length))
 
-    def generate_test_cases(self, num_cases: int) -> None:
+    def iter_test_cases(self, num_cases: int) -> Iterator[str]:
+        if self.generator is not None:
+            yield from self.generator.iter_strings(num_cases)
+            return
         for _ in range(num_cases):
-            self.test_cases.append(self.generate_random_string())
+            yield self.generate_random_string()
+
+    def generate_test_cases(self, num_cases: int) -> None:
+        self.test_cases.extend(self.iter_test_cases(num_cases))
+
+    def get_rng_state(self):
+        return self.generator.get_state() if self.generator is not None else self.rng.getstate()
+
+    def set_rng_state(self, state) -> None:
+        if self.generator is not None:
+            self.generator.set_state(state)
+        else:
+            self.rng.setstate(state)
     
-    def run_tests(self) -> List[Dict[str, Any]]:
-        results = []
-        for case in self.test_cases:
-            try:
-                result = self.target_function(case)
-                results.append({'input': case, 'output': result, 'error': None})
-            except Exception as e:
-                results.append({'input': case, 'output': None, 'error': str(e)})
-        return results
+    def case_runner(self) -> Callable[[Any], Dict[str, Any]]:
+        return functools.partial(run_case, self.target_function)
+
+    def run_cases(self, cases: Iterable[Any], workers: int = 1, executor: str = 'process',
+                  chunk_size: int = 64) -> Iterator[Dict[str, Any]]:
+        engine = ParallelRunner(workers, executor, chunk_size)
+        return engine.run(self.case_runner(), cases)
+
+    def run_tests(self, workers: int = 1, executor: str = 'process', chunk_size: int = 64) -> List[Dict[str, Any]]:
+        return list(self.run_cases(self.test_cases, workers, executor, chunk_size))
+
+    def stream_tests(self, num_cases: int, filename: str, workers: int = 1, executor: str = 'process',
+                     chunk_size: int = 64, progress: Optional[Callable[[int, float], None]] = None) -> int:
+        # Generation, execution and output are chained generators, so memory stays flat.
+        results = self.run_cases(self.iter_test_cases(num_cases), workers, executor, chunk_size)
+        return write_results_jsonl(results, filename, progress)
+
+    def index_tests(self, num_cases: int, filename: str, workers: int = 1, executor: str = 'process',
+                    chunk_size: int = 64) -> 'ResultIndex':
+        results = self.run_cases(self.iter_test_cases(num_cases), workers, executor, chunk_size)
+        return save_indexed_results(results, filename)
 
     def save_results(self, results: List[Dict[str, Any]], filename: str) -> None:
         with open(filename, 'w') as f:
             json.dump(results, f, indent=4)
 
 
+def write_results_jsonl(results: Iterable[Dict[str, Any]], filename: str,
+                        progress: Optional[Callable[[int, float], None]] = None,
+                        progress_every: int = 10000) -> int:
+    count = 0
+    start = time.perf_counter()
+    with open(filename, 'w') as f:
+        for result in results:
+            f.write(json.dumps(result, default=repr) + '\n')
+            count += 1
+            if progress and count % progress_every == 0:
+                progress(count, count / (time.perf_counter() - start))
+    if progress and count % progress_every:
+        progress(count, count / max(time.perf_counter() - start, 1e-9))
+    return count
+
+
+def print_progress(count: int, cases_per_second: float) -> None:
+    print(f"{count} cases ({cases_per_second:.0f} cases/s)")
+
+
+def normalize_message(message: str) -> str:
+    message = re.sub(r"0x[0-9a-fA-F]+", "<addr>", message)
+    message = re.sub(r"(['\"]).*?\1", "<str>", message)
+    return re.sub(r"\d+", "N", message)[:200]
+
+
+class ResultIndex:
+    def __init__(self):
+        self.total = 0
+        self.successes = 0
+        self.buckets = {}
+
+    @staticmethod
+    def classify(result: Dict[str, Any]):
+        # Returns (error_type, signature) for failures and None for successes.
+        if 'returncode' in result:
+            if result.get('error') is not None:
+                return result.get('error_type', 'CommandError'), normalize_message(result['error'])
+            if result['returncode'] == 0:
+                return None
+            error_type = f"signal {-result['returncode']}" if result['returncode'] < 0 else f"exit {result['returncode']}"
+            stderr = result['stderr'].strip().splitlines()
+            return error_type, normalize_message(stderr[-1] if stderr else '')
+        if result.get('error') is None:
+            return None
+        return result.get('error_type', 'Error'), result.get('crash_site') or normalize_message(result['error'])
+
+    def add(self, result: Dict[str, Any]) -> None:
+        self.total += 1
+        failure = self.classify(result)
+        if failure is None:
+            self.successes += 1
+            return
+        error_type, signature = failure
+        key = hashlib.sha1(f"{error_type}|{signature}".encode()).hexdigest()[:12]
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            self.buckets[key] = {
+                'error_type': error_type,
+                'signature': signature,
+                'message': result.get('error') or result.get('stderr', ''),
+                'count': 1,
+                'reproducer': result['input'],
+            }
+            return
+        bucket['count'] += 1
+        # Keep the shortest input seen as the bucket's reproducer.
+        if len(json.dumps(result['input'], default=repr)) < len(json.dumps(bucket['reproducer'], default=repr)):
+            bucket['reproducer'] = result['input']
+            bucket['message'] = result.get('error') or result.get('stderr', '')
+
+    def add_all(self, results: Iterable[Dict[str, Any]]) -> 'ResultIndex':
+        for result in results:
+            self.add(result)
+        return self
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        return self.buckets[key]
+
+    def by_type(self, error_type: str) -> Dict[str, Dict[str, Any]]:
+        return {key: bucket for key, bucket in self.buckets.items() if bucket['error_type'] == error_type}
+
+    def minimize_reproducers(self, runner: Callable[[Any], Dict[str, Any]], workers: int = 1,
+                             executor: str = 'process') -> None:
+        minimizer = DeltaMinimizer(runner, workers, executor)
+        with minimizer.engine.keep_pool(runner):
+            for bucket in self.buckets.values():
+                try:
+                    bucket['reproducer'] = minimizer.minimize(bucket['reproducer'])
+                except (TypeError, ValueError):
+                    continue  # unsupported input type or no longer reproducible
+
+    @property
+    def failures(self) -> int:
+        return self.total - self.successes
+
+    def save(self, filename: str) -> None:
+        with open(filename, 'w') as f:
+            json.dump({'total': self.total, 'successes': self.successes, 'buckets': self.buckets}, f, default=repr)
+
+    @classmethod
+    def load(cls, filename: str) -> 'ResultIndex':
+        with open(filename) as f:
+            data = json.load(f)
+        index = cls()
+        index.total = data['total']
+        index.successes = data['successes']
+        index.buckets = data['buckets']
+        return index
+
+
+class DeltaMinimizer:
+    def __init__(self, runner: Callable[[Any], Dict[str, Any]], workers: int = 1, executor: str = 'process'):
+        self.runner = runner
+        self.engine = ParallelRunner(workers, executor, chunk_size=1)
+        self.cache = {}
+        self.executions = 0
+
+    @staticmethod
+    def _digest(candidate: Any) -> str:
+        return hashlib.sha1(json.dumps(candidate, sort_keys=True, default=repr).encode()).hexdigest()
+
+    def _classify_all(self, candidates: List[Any]) -> List[Any]:
+        # Only candidates never seen before are executed, all of them in one parallel batch.
+        digests = [self._digest(candidate) for candidate in candidates]
+        fresh = {}
+        for digest, candidate in zip(digests, candidates):
+            if digest not in self.cache:
+                fresh.setdefault(digest, candidate)
+        for digest, result in zip(fresh, self.engine.run(self.runner, fresh.values())):
+            self.cache[digest] = ResultIndex.classify(result)
+        self.executions += len(fresh)
+        return [self.cache[digest] for digest in digests]
+
+    def minimize(self, failing_input: Any) -> Any:
+        if isinstance(failing_input, str):
+            items, build = list(failing_input), ''.join
+        elif isinstance(failing_input, dict):
+            items, build = list(failing_input.items()), dict
+        else:
+            raise TypeError(f"Cannot minimize input of type {type(failing_input).__name__}")
+
+        # One pool serves every round; starting a pool per round costs more than small inputs take to run.
+        with self.engine.keep_pool(self.runner):
+            return build(self._minimize(items, build, failing_input))
+
+    def _minimize(self, items: List[Any], build: Callable[[List[Any]], Any], failing_input: Any) -> List[Any]:
+        target = self._classify_all([failing_input])[0]
+        if target is None:
+            raise ValueError("Input does not fail")
+
+        granularity = 2
+        while len(items) >= 2:
+            size = -(-len(items) // granularity)
+            subsets = [items[i:i + size] for i in range(0, len(items), size)]
+            complements = [items[:i] + items[i + size:] for i in range(0, len(items), size)]
+            outcomes = self._classify_all([build(c) for c in subsets + complements])
+            hits = [i for i, outcome in enumerate(outcomes) if outcome == target]
+            if hits and hits[0] < len(subsets):
+                items, granularity = subsets[hits[0]], 2
+            elif hits:
+                items, granularity = complements[hits[0] - len(subsets)], max(granularity - 1, 2)
+            elif granularity < len(items):
+                granularity = min(granularity * 2, len(items))
+            else:
+                break
+        if len(items) == 1 and self._classify_all([build([])])[0] == target:
+            items = []
+        return items
+
+
+def save_indexed_results(results: Iterable[Dict[str, Any]], filename: str) -> ResultIndex:
+    index = ResultIndex().add_all(results)
+    index.save(filename)
+    return index
+
+
 def example_function(input_data: Any) -> str:
     if isinstance(input_data, str) and len(input_data) > 0:
         return f"Processed: {input_data}"
@@ -61,9 +537,12 @@ class CommandFuzzer:
         self.max_attempts = max_attempts
 
     def run_command(self, input_data: str) -> subprocess.CompletedProcess:
-        process = subprocess.run(self.command, input=input_data.encode(), capture_output=True, text=True, shell=True)
+        process = subprocess.run(self.command, input=input_data, capture_output=True, text=True, shell=True)
         return process
 
+    def case_runner(self) -> Callable[[str], Dict[str, Any]]:
+        return functools.partial(run_command_case, self.command)
+
     def fuzz(self) -> List[Dict[str, Any]]:
         results = []
         for _ in range(self.max_attempts):
@@ -78,15 +557,24 @@ class CommandFuzzer:
         return results
 
 
+def run_command_case(command: str, input_data: str) -> Dict[str, Any]:
+    process = subprocess.run(command, input=input_data, capture_output=True, text=True, shell=True)
+    return {'input': input_data, 'stdout': process.stdout, 'stderr': process.stderr, 'returncode': process.returncode}
+
+
 def command_input_generator() -> str:
-    return ''.join(random.choices(string.ascii_letters + string.digits + ' ', k=random.randint(1, 50)))
+    return ''.join(random.choices(COMMAND_CHARSET, k=random.randint(1, 50)))
+
+
+def batched_command_input_generator(seed: Optional[int] = None, batch_size: int = 4096) -> BatchStringGenerator:
+    return BatchStringGenerator(COMMAND_CHARSET, 1, 50, seed, batch_size)
 
 
 def main_command_fuzzer():
     command = "echo"  # Example command
-    fuzzer = CommandFuzzer(command(command_input_generator, 5)
+    fuzzer = CommandFuzzer(command, command_input_generator, 5)
     results = fuzzer.fuzz()
-    fuzzer.save_results(results, 'command_fuzz_results.json')
+    save_indexed_results(results, 'command_fuzz_results.json')
 
 
 if __name__ == "__main__":
@@ -98,6 +586,136 @@ def save_command_results(results: List[Dict[str, Any]], filename: str) -> None:
         json.dump(results, f, indent=4)
 
 
+class ShellWorker:
+    """Long-lived shell that runs the command once per framed request on its stdin."""
+
+    STREAM_LIMIT = 2 ** 24  # bytes of stdout or stderr a single case may produce
+
+    def __init__(self, command: str, shell: str = '/bin/sh', isolate: bool = True):
+        self.command = command
+        self.shell = shell
+        self.isolate = isolate
+        self.marker = f"__fuzz_{os.urandom(8).hex()}__"
+        self.process = None
+        # The case payload goes through a scratch file so it reaches the command byte for byte.
+        self.input_fd, self.input_path = tempfile.mkstemp(
+            prefix='fuzz_input_', dir='/dev/shm' if os.path.isdir('/dev/shm') else None)
+
+    async def start(self) -> None:
+        self.process = await asyncio.create_subprocess_exec(
+            self.shell, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            start_new_session=True, limit=self.STREAM_LIMIT)
+
+    def frame(self) -> bytes:
+        # A subshell costs one fork but keeps variables, cd, traps and umask from leaking into the
+        # next case, so results match a one-shot run; a brace group (isolate=False) skips the fork
+        # for commands known to leave no state behind.
+        group = f"( {self.command}\n)" if self.isolate else f"{{ {self.command}\n}}"
+        return (f"{group} < '{self.input_path}'\n"
+                f"printf '\\n{self.marker} %d\\n' $?\n"
+                f"printf '\\n{self.marker}\\n' >&2\n").encode()
+
+    async def run(self, input_data: str) -> Dict[str, Any]:
+        payload = input_data.encode()
+        os.ftruncate(self.input_fd, 0)
+        os.pwrite(self.input_fd, payload, 0)
+        self.process.stdin.write(self.frame())
+        await self.process.stdin.drain()
+        stdout_end = f"\n{self.marker} ".encode()
+        stderr_end = f"\n{self.marker}\n".encode()
+        try:
+            stdout = (await self.process.stdout.readuntil(stdout_end))[:-len(stdout_end)]
+            returncode = int(await self.process.stdout.readline())
+            stderr = (await self.process.stderr.readuntil(stderr_end))[:-len(stderr_end)]
+        except asyncio.IncompleteReadError as e:
+            # The command took the shell down with it (exit, exec, a fatal signal): report the
+            # shell's status as the command's, just like a one-shot subprocess would.
+            stdout = e.partial
+            stderr = await self.process.stderr.read()
+            returncode = await self.process.wait()
+            await self.start()
+        return {
+            'input': input_data,
+            'stdout': stdout.decode(errors='replace'),
+            'stderr': stderr.decode(errors='replace'),
+            'returncode': returncode,
+            'error': None,
+        }
+
+    async def stop(self) -> None:
+        if self.process is None or self.process.returncode is not None:
+            return
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        await self.process.wait()
+
+    async def restart(self) -> None:
+        await self.stop()
+        await self.start()
+
+    async def close(self) -> None:
+        await self.stop()
+        os.close(self.input_fd)
+        os.unlink(self.input_path)
+
+
+class PersistentCommandFuzzer(CommandFuzzer):
+    def __init__(self, command: str, input_generator: Callable[[], str], max_attempts: int = 100,
+                 workers: int = 4, timeout: float = 5.0, shell: str = '/bin/sh', isolate: bool = True):
+        super().__init__(command, input_generator, max_attempts)
+        self.workers = workers
+        self.timeout = timeout
+        self.shell = shell
+        self.isolate = isolate
+
+    async def _drain(self, worker: ShellWorker, cases: Iterator[Any], results: List[Dict[str, Any]]) -> None:
+        await worker.start()
+        try:
+            for index, input_data in cases:
+                try:
+                    results[index] = await asyncio.wait_for(worker.run(input_data), self.timeout)
+                except asyncio.TimeoutError:
+                    results[index] = self._failed(input_data, 'Timeout', f"Command timed out after {self.timeout}s")
+                    await worker.restart()
+                except asyncio.LimitOverrunError:
+                    # The rest of the output is still in the pipe, so the shell cannot be reused.
+                    results[index] = self._failed(input_data, 'OutputTooLarge',
+                                                  f"Command output exceeded {ShellWorker.STREAM_LIMIT} bytes")
+                    await worker.restart()
+                except (ConnectionError, ValueError) as e:
+                    results[index] = self._failed(input_data, 'WorkerCrash', f"Worker shell died: {e!r}")
+                    await worker.restart()
+        finally:
+            await worker.close()
+
+    def _failed(self, input_data: str, error_type: str, error: str) -> Dict[str, Any]:
+        return {'input': input_data, 'stdout': '', 'stderr': '', 'returncode': None, 'error': error,
+                'error_type': error_type}
+
+    async def fuzz_async(self) -> List[Dict[str, Any]]:
+        results = [None] * self.max_attempts
+        # Workers pull from one shared iterator, so inputs are generated lazily and results keep their order.
+        cases = enumerate(self.input_generator() for _ in range(self.max_attempts))
+        await asyncio.gather(*(self._drain(ShellWorker(self.command, self.shell, self.isolate), cases, results)
+                               for _ in range(self.workers)))
+        return results
+
+    def fuzz(self) -> List[Dict[str, Any]]:
+        return asyncio.run(self.fuzz_async())
+
+
+def main_persistent_command_fuzzer():
+    fuzzer = PersistentCommandFuzzer("echo", command_input_generator, 1000, workers=4, timeout=1.0)
+    results = fuzzer.fuzz()
+    save_command_results(results, 'persistent_command_fuzz_results.json')
+
+
+if __name__ == "__main__":
+    main_persistent_command_fuzzer()
+
+
 def advanced_example_function(input_data: Any) -> str:
     if isinstance(input_data, str) and len(input_data) > 0:
         if "fail" in input_data:
@@ -111,6 +729,9 @@ def main_advanced_fuzzer():
     tester.generate_test_cases(100)
     results = tester.run_tests()
     tester.save_results(results, 'advanced_fuzz_test_results.json')
+    failures = [r['input'] for r in results if r['error']]
+    if failures:
+        print(DeltaMinimizer(tester.case_runner()).minimize(failures[0]))
 
 
 if __name__ == "__main__":
@@ -118,18 +739,109 @@ if __name__ == "__main__":
 
 
 class FuzzerConfig:
-    def __init__(self, target_function: Callable[[Any], Any], num_cases: int, output_file: str):
+    def __init__(self, target_function: Callable[[Any], Any], num_cases: int, output_file: str,
+                 streaming: bool = False, workers: int = 1, indexed: bool = False,
+                 checkpoint_file: Optional[str] = None, checkpoint_every: int = 100000, resume: bool = False):
         self.target_function = target_function
         self.num_cases = num_cases
         self.output_file = output_file
+        self.streaming = streaming
+        self.workers = workers
+        self.indexed = indexed
+        self.checkpoint_file = checkpoint_file
+        self.checkpoint_every = checkpoint_every
+        self.resume = resume
+        if checkpoint_file and not (streaming or indexed):
+            raise ValueError("Checkpointing requires streaming or indexed output")
 
     def create_tester(self) -> FuzzTester:
         return FuzzTester(self.target_function)
 
+    def save_checkpoint(self, state: Dict[str, Any]) -> None:
+        # Write-then-rename so a kill mid-write leaves the previous checkpoint intact.
+        temp_file = self.checkpoint_file + '.tmp'
+        with open(temp_file, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.checkpoint_file)
+
+    def load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        if not (self.resume and os.path.exists(self.checkpoint_file)):
+            return None
+        with open(self.checkpoint_file, 'rb') as f:
+            state = pickle.load(f)
+        if state['num_cases'] != self.num_cases:
+            raise ValueError(f"Checkpoint was taken for {state['num_cases']} cases, not {self.num_cases}")
+        return state
+
+    def execute_checkpointed(self, tester: FuzzTester) -> None:
+        state = self.load_checkpoint()
+        cursor = 0
+        index = ResultIndex() if self.indexed else None
+        output = None
+        if state:
+            cursor = state['cursor']
+            tester.set_rng_state(state['rng'])
+            if index:
+                index.total, index.successes, index.buckets = state['index']
+        if not self.indexed:
+            output = open(self.output_file, 'r+b' if state else 'wb')
+            if state:
+                output.seek(state['offset'])
+                output.truncate()
+
+        # RNG snapshots are taken as cases are generated but only written once every earlier
+        # result is out, since the engine keeps a window of cases in flight.
+        snapshots = deque()
+
+        def cases() -> Iterator[Any]:
+            generated = tester.iter_test_cases(self.num_cases - cursor)
+            for position in range(cursor, self.num_cases):
+                if position > cursor and position % self.checkpoint_every == 0:
+                    snapshots.append((position, tester.get_rng_state()))
+                yield next(generated)
+
+        engine = ParallelRunner(self.workers)
+        try:
+            for done, result in enumerate(engine.run(tester.case_runner(), cases()), cursor):
+                # The snapshot for position N is always taken before case N runs, so it is
+                # queued by the time result N arrives, whatever the number of workers.
+                if snapshots and snapshots[0][0] == done:
+                    _, rng_state = snapshots.popleft()
+                    checkpoint = {'num_cases': self.num_cases, 'cursor': done, 'rng': rng_state}
+                    if index:
+                        checkpoint['index'] = (index.total, index.successes, index.buckets)
+                    else:
+                        output.flush()
+                        os.fsync(output.fileno())
+                        checkpoint['offset'] = output.tell()
+                    self.save_checkpoint(checkpoint)
+                if index:
+                    index.add(result)
+                else:
+                    output.write(json.dumps(result, default=repr).encode() + b'\n')
+        finally:
+            if output:
+                output.close()
+        if index:
+            index.save(self.output_file)
+        if os.path.exists(self.checkpoint_file):
+            os.remove(self.checkpoint_file)
+
     def execute(self) -> None:
         tester = self.create_tester()
+        if self.checkpoint_file:
+            self.execute_checkpointed(tester)
+            return
+        if self.indexed:
+            tester.index_tests(self.num_cases, self.output_file, workers=self.workers)
+            return
+        if self.streaming:
+            tester.stream_tests(self.num_cases, self.output_file, workers=self.workers, progress=print_progress)
+            return
         tester.generate_test_cases(self.num_cases)
-        results = tester.run_tests()
+        results = tester.run_tests(workers=self.workers)
         tester.save_results(results, self.output_file)
 
 
@@ -147,24 +859,53 @@ class FileFuzzer:
         with open(self.file_path, 'r') as file:
             return file.readlines()
 
-    def fuzz_file(self) -> List[Dict[str, Any]]:
-        results = []
-        lines = self.read_file()
-        for line in lines:
-            line = line.strip()
-            if line:
-                try:
-                    result = self.target_function(line)
-                    results.append({'input': line, 'output': result, 'error': None})
-                except Exception as e:
-                    results.append({'input': line, 'output': None, 'error': str(e)})
-        return results
+    def case_runner(self) -> Callable[[Any], Dict[str, Any]]:
+        return functools.partial(run_case, self.target_function)
+
+    def iter_byte_ranges(self, chunk_bytes: int = 1 << 20) -> Iterator[Tuple[int, int]]:
+        # Only the bytes around each boundary are touched here; workers read the lines themselves.
+        size = os.path.getsize(self.file_path)
+        if size == 0:
+            return
+        with open(self.file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            while start < size:
+                newline = mm.find(b'\n', start + chunk_bytes - 1)
+                end = newline + 1 if newline != -1 else size
+                yield start, end
+                start = end
+
+    def iter_results(self, workers: int = 1, executor: str = 'process',
+                     chunk_bytes: int = 1 << 20) -> Iterator[Dict[str, Any]]:
+        engine = ParallelRunner(workers, executor, chunk_size=1)
+        runner = functools.partial(fuzz_file_range, self.case_runner(), self.file_path)
+        for results in engine.run(runner, self.iter_byte_ranges(chunk_bytes)):
+            if isinstance(results, list):
+                yield from results
+            else:
+                yield results  # a crashed worker is reported once for its whole byte range
+
+    def fuzz_file(self, workers: int = 1, executor: str = 'process', chunk_bytes: int = 1 << 20) -> List[Dict[str, Any]]:
+        return list(self.iter_results(workers, executor, chunk_bytes))
+
+
+def fuzz_file_range(runner: Callable[[Any], Dict[str, Any]], file_path: str,
+                    byte_range: Tuple[int, int]) -> List[Dict[str, Any]]:
+    start, end = byte_range
+    with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        lines = mm[start:end].split(b'\n')
+    results = []
+    for raw in lines:
+        line = raw.decode('utf-8', errors='replace').strip()
+        if line:
+            results.append(runner(line))
+    return results
 
 
 def main_file_fuzzer():
     file_fuzzer = FileFuzzer(advanced_example_function, 'input_file.txt')
     results = file_fuzzer.fuzz_file()
-    file_fuzzer.save_results(results, 'file_fuzz_results.json')
+    save_indexed_results(results, 'file_fuzz_results.json')
 
 
 if __name__ == "__main__":
@@ -172,27 +913,52 @@ if __name__ == "__main__":
 
 
 class RandomJsonFuzzer:
-    def __init__(self, target_function: Callable[[Any], Any], json_structure: Dict[str, List[Any]], num_cases: int):
+    def __init__(self, target_function: Callable[[Any], Any], json_structure: Dict[str, List[Any]], num_cases: int,
+                 seed: Optional[int] = None, batch_size: int = 0):
         self.target_function = target_function
         self.json_structure = json_structure
         self.num_cases = num_cases
+        self.batch_size = batch_size
+        if batch_size and np is None:
+            raise ImportError("Batched JSON generation requires numpy")
+        self.rng = np.random.default_rng(seed) if batch_size else None
+        self.scalar_rng = random.Random(seed)
 
     def generate_random_json(self) -> Dict[str, Any]:
         random_json = {}
         for key, value in self.json_structure.items():
-            random_json[key] = random.choice(value)
+            random_json[key] = self.scalar_rng.choice(value)
         return random_json
 
-    def fuzz(self) -> List[Dict[str, Any]]:
-        results = []
-        for _ in range(self.num_cases):
-            random_json = self.generate_random_json()
-            try:
-                result = self.target_function(random_json)
-                results.append({'input': random_json, 'output': result, 'error': None})
-            except Exception as e:
-                results.append({'input': random_json, 'output': None, 'error': str(e)})
-        return results
+    def generate_random_json_columns(self, size: int) -> Dict[str, List[Any]]:
+        # One vectorized draw per key; values stay plain Python objects.
+        columns = {}
+        for key, value in self.json_structure.items():
+            choices = self.rng.integers(0, len(value), size=size).tolist()
+            columns[key] = [value[i] for i in choices]
+        return columns
+
+    def iter_random_json(self) -> Iterator[Dict[str, Any]]:
+        if not self.batch_size:
+            for _ in range(self.num_cases):
+                yield self.generate_random_json()
+            return
+        keys = list(self.json_structure)
+        remaining = self.num_cases
+        while remaining > 0:
+            columns = self.generate_random_json_columns(self.batch_size)
+            rows = zip(*(columns[key][:remaining] for key in keys))
+            for row in rows:
+                yield dict(zip(keys, row))
+            remaining -= self.batch_size
+
+    def case_runner(self) -> Callable[[Any], Dict[str, Any]]:
+        return functools.partial(run_case, self.target_function)
+
+    def fuzz(self, workers: int = 1, executor: str = 'process', chunk_size: int = 64) -> List[Dict[str, Any]]:
+        cases = self.iter_random_json()
+        engine = ParallelRunner(workers, executor, chunk_size)
+        return list(engine.run(self.case_runner(), cases))
 
 
 def json_function(input_data: Dict[str, Any]) -> str:
@@ -209,7 +975,7 @@ def main_json_fuzzer():
     }
     fuzzer = RandomJsonFuzzer(json_function, json_structure, 100)
     results = fuzzer.fuzz()
-    fuzzer.save_results(results, 'json_fuzz_results.json')
+    save_indexed_results(results, 'json_fuzz_results.json')
 
 
 if __name__ == "__main__":
@@ -217,33 +983,172 @@ if __name__ == "__main__":
 
 
 class TimeoutFuzzTester(FuzzTester):
-    def __init__(self, target_function: Callable[[Any], Any], max_length: int, timeout: int):
+    def __init__(self, target_function: Callable[[Any], Any], max_length: int, timeout: float, spares: int = 1):
         super().__init__(target_function, max_length)
         self.timeout = timeout
+        self.spares = spares
+        self.latency_stats = {}
+        self._runner = None
 
-    def run_tests(self) -> List[Dict[str, Any]]:
-        results = []
-        for case in self.test_cases:
-            try:
-                result = self.run_with_timeout(case)
-                results.append({'input': case, 'output': result, 'error': None})
-            except Exception as e:
-                results.append({'input': case, 'output': None, 'error': str(e)})
-        return results
+    def case_runner(self) -> Callable[[Any], Dict[str, Any]]:
+        return TimeoutRunner(self.target_function, self.timeout, self.spares)
 
     def run_with_timeout(self, case: Any) -> Any:
-        import signal
+        if self._runner is None:
+            self._runner = self.case_runner()
+        result = self._runner(case)
+        if result['error'] is None:
+            return result['output']
+        if result['error_type'] == 'Timeout':
+            raise TimeoutError(result['error'])
+        raise RuntimeError(f"{result['error_type']}: {result['error']}")
+
+    def run_cases(self, cases: Iterable[Any], workers: int = 1, executor: str = 'process',
+                  chunk_size: int = 16) -> Iterator[Dict[str, Any]]:
+        # Cases always run in warm worker processes whose deadlines are enforced by the parent,
+        # so any thread can drive the pool; the executor only picks how cases are handed out.
+        runner = functools.partial(run_case, self.target_function)
+        with WarmProcessPool(runner, workers, self.timeout, self.spares) as pool:
+            engine = ParallelRunner(workers, 'thread', chunk_size)
+            yield from engine.run(pool.run, cases)
+
+    def run_tests(self, workers: int = 1, executor: str = 'process', chunk_size: int = 16) -> List[Dict[str, Any]]:
+        results = super().run_tests(workers, executor, chunk_size)
+        self.latency_stats = latency_percentiles(results)
+        return results
 
-        def handler(signum, frame):
-            raise TimeoutError("Function call timed out")
 
-        signal.signal(signal.SIGALRM, handler)
-        signal.alarm(self.timeout)
+def _timeout_worker(conn, runner: Callable[[Any], Dict[str, Any]]) -> None:
+    while True:
         try:
-            result = self.target_function(case)
-        finally:
-            signal.alarm(0)  # Disable the alarm
-        return result
+            case = conn.recv()
+        except EOFError:
+            return
+        start = time.perf_counter()
+        result = runner(case)
+        result['latency'] = time.perf_counter() - start
+        try:
+            conn.send(result)
+        except Exception:
+            result['output'] = repr(result['output'])
+            conn.send(result)
+
+
+class WarmProcessPool:
+    def __init__(self, runner: Callable[[Any], Dict[str, Any]], workers: int = 1, timeout: float = 1.0,
+                 spares: int = 1):
+        self.runner = runner
+        self.timeout = timeout
+        self.restarts = 0
+        self._spawn_lock = threading.Lock()
+        self.idle = queue.Queue()
+        self.spares = queue.Queue()
+        for _ in range(max(1, workers)):
+            self.idle.put(self._spawn())
+        for _ in range(spares):
+            self.spares.put(self._spawn())
+
+    def _spawn(self):
+        # Serialise forks so no worker inherits another worker's pipe end; a stray copy
+        # would hide that worker's EOF when it crashes.
+        with self._spawn_lock:
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_timeout_worker, args=(child_conn, self.runner), daemon=True)
+            process.start()
+            child_conn.close()
+        return process, parent_conn
+
+    def _replace(self, process, conn) -> None:
+        process.kill()
+        process.join()
+        conn.close()
+        self.restarts += 1
+        try:
+            self.idle.put(self.spares.get_nowait())
+        except queue.Empty:
+            self.idle.put(self._spawn())
+        # Top the spares back up off the hot path.
+        threading.Thread(target=lambda: self.spares.put(self._spawn()), daemon=True).start()
+
+    def run(self, case: Any) -> Dict[str, Any]:
+        try:
+            process, conn = self.idle.get_nowait()
+        except queue.Empty:
+            # More concurrent callers than warm workers: grow rather than make them queue.
+            process, conn = self._spawn()
+        start = time.perf_counter()
+        try:
+            conn.send(case)
+            if conn.poll(self.timeout):
+                result = conn.recv()
+                self.idle.put((process, conn))
+                return result
+            error_type, error = 'Timeout', f"Function call timed out after {self.timeout}s"
+        except (EOFError, OSError) as e:
+            error_type, error = 'WorkerCrash', f"Worker crashed: {e!r}"
+        elapsed = time.perf_counter() - start
+        self._replace(process, conn)
+        return {'input': case, 'output': None, 'error': error, 'error_type': error_type, 'latency': elapsed}
+
+    def close(self) -> None:
+        for workers in (self.idle, self.spares):
+            while not workers.empty():
+                process, conn = workers.get_nowait()
+                # Idle workers hold no state, and their pipes may be shared with siblings, so
+                # waiting for EOF is not reliable.
+                conn.close()
+                process.kill()
+                process.join()
+
+    def __enter__(self) -> 'WarmProcessPool':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class TimeoutRunner:
+    """Case runner whose deadline works from any thread; each calling process starts its own warm pool."""
+
+    def __init__(self, target_function: Callable[[Any], Any], timeout: float, spares: int = 1):
+        self.target_function = target_function
+        self.timeout = timeout
+        self.spares = spares
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> WarmProcessPool:
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    runner = functools.partial(run_case, self.target_function)
+                    self._pool = WarmProcessPool(runner, 1, self.timeout, self.spares)
+                    self._pid = os.getpid()
+        return self._pool
+
+    def __call__(self, case: Any) -> Dict[str, Any]:
+        return self._get_pool().run(case)
+
+    def close(self) -> None:
+        if self._pool is not None and self._pid == os.getpid():
+            self._pool.close()
+        self._pool = self._pid = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {'target_function': self.target_function, 'timeout': self.timeout, 'spares': self.spares}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+
+def latency_percentiles(results: List[Dict[str, Any]], percentiles=(50, 90, 99)) -> Dict[str, float]:
+    latencies = sorted(r['latency'] for r in results if 'latency' in r)
+    if not latencies:
+        return {}
+    stats = {f"p{p}": latencies[min(len(latencies) - 1, len(latencies) * p // 100)] for p in percentiles}
+    stats['max'] = latencies[-1]
+    return stats
 
 
 def slow_function(input_data: str) -> str:
@@ -254,9 +1159,159 @@ def slow_function(input_data: str) -> str:
 def main_timeout_fuzzer():
     timeout_tester = TimeoutFuzzTester(slow_function, 100, timeout=0.5)
     timeout_tester.generate_test_cases(50)
-    results = timeout_tester.run_tests()
+    results = timeout_tester.run_tests(workers=4)
+    print(timeout_tester.latency_stats)
     timeout_tester.save_results(results, 'timeout_fuzz_results.json')
 
 
 if __name__ == "__main__":
-    main_timeout_fuzzer()
\ No newline at end of file
+    main_timeout_fuzzer()
+
+
+class CoverageTracer:
+    def __init__(self, paths: Iterable[str]):
+        self.paths = set(paths)
+        self.edges = set()
+        self._prev = None
+
+    def _trace_call(self, frame, event, arg):
+        # Returning None for foreign files keeps the tracer off library frames entirely.
+        if frame.f_code.co_filename not in self.paths:
+            return None
+        return self._trace_line
+
+    def _trace_line(self, frame, event, arg):
+        if event == 'line':
+            location = (frame.f_code.co_filename, frame.f_lineno)
+            self.edges.add((self._prev, location))
+            self._prev = location
+        return self._trace_line
+
+    def trace(self, function: Callable[[Any], Any], case: Any):
+        self.edges = set()
+        self._prev = None
+        sys.settrace(self._trace_call)
+        try:
+            return function(case)
+        finally:
+            sys.settrace(None)
+
+
+def code_string_constants(function: Callable[[Any], Any]) -> List[str]:
+    tokens = []
+    stack = [getattr(function, '__code__', None)]
+    while stack:
+        code = stack.pop()
+        if code is None:
+            continue
+        for const in code.co_consts:
+            if isinstance(const, str) and const:
+                tokens.append(const)
+            elif inspect.iscode(const):
+                stack.append(const)
+    return tokens
+
+
+class CoverageGuidedFuzzer(FuzzTester):
+    def __init__(self, target_function: Callable[[Any], Any], max_length: int = 100,
+                 dictionary: Optional[List[str]] = None, seed: Optional[int] = None,
+                 trace_paths: Optional[List[str]] = None):
+        # Initial cases, fallback seeds and mutations all draw from self.rng, so a seed reproduces the whole run.
+        super().__init__(target_function, max_length, seed)
+        self.dictionary = list(dictionary or []) + code_string_constants(target_function)
+        if trace_paths is None:
+            trace_paths = [inspect.getfile(target_function)]
+        self.tracer = CoverageTracer(trace_paths)
+        self.coverage = set()
+        self.corpus = []
+        self.picks = []
+        self.failures = {}
+        self.stats = {}
+        self.mutators = [self.flip_bit, self.insert_char, self.delete_range, self.splice]
+        if self.dictionary:
+            self.mutators.append(self.insert_token)
+
+    def flip_bit(self, data: str) -> str:
+        if not data:
+            return self.insert_char(data)
+        i = self.rng.randrange(len(data))
+        return data[:i] + chr(ord(data[i]) ^ (1 << self.rng.randrange(7))) + data[i + 1:]
+
+    def insert_char(self, data: str) -> str:
+        i = self.rng.randint(0, len(data))
+        return data[:i] + self.rng.choice(FUZZ_CHARSET) + data[i:]
+
+    def delete_range(self, data: str) -> str:
+        if len(data) < 2:
+            return data
+        i = self.rng.randrange(len(data))
+        j = self.rng.randint(i + 1, min(len(data), i + 8))
+        return data[:i] + data[j:]
+
+    def splice(self, data: str) -> str:
+        other = self.rng.choice(self.corpus) if self.corpus else self.generate_random_string()
+        return data[:self.rng.randint(0, len(data))] + other[self.rng.randint(0, len(other)):]
+
+    def insert_token(self, data: str) -> str:
+        i = self.rng.randint(0, len(data))
+        return data[:i] + self.rng.choice(self.dictionary) + data[i:]
+
+    def mutate(self, data: str) -> str:
+        for _ in range(self.rng.randint(1, 4)):
+            data = self.rng.choice(self.mutators)(data)
+        return data[:self.max_length]
+
+    def schedule(self) -> int:
+        # Favour seeds that have been mutated less often so fresh coverage gets explored first.
+        index = self.rng.choices(range(len(self.corpus)), weights=[1 / (1 + p) for p in self.picks])[0]
+        self.picks[index] += 1
+        return index
+
+    def execute(self, case: Any) -> Optional[Dict[str, Any]]:
+        result = run_case(functools.partial(self.tracer.trace, self.target_function), case)
+        if result['error'] is not None:
+            self.failures.setdefault(result['error'], case)
+        new_edges = self.tracer.edges - self.coverage
+        if not new_edges:
+            return None
+        self.coverage |= new_edges
+        self.corpus.append(case)
+        self.picks.append(0)
+        return result
+
+    def fuzz(self, iterations: int, initial_cases: int = 16,
+             on_iteration: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        results = []
+        for case in self.test_cases or list(self.iter_test_cases(initial_cases)):
+            result = self.execute(case)
+            if result:
+                results.append(result)
+        start = time.perf_counter()
+        for iteration in range(1, iterations + 1):
+            seed = self.corpus[self.schedule()] if self.corpus else self.generate_random_string()
+            result = self.execute(self.mutate(seed))
+            if result:
+                results.append(result)
+            self.stats = {
+                'iteration': iteration,
+                'new_coverage': result is not None,
+                'edges': len(self.coverage),
+                'corpus_size': len(self.corpus),
+                'unique_errors': len(self.failures),
+                'execs_per_sec': iteration / max(time.perf_counter() - start, 1e-9),
+            }
+            if on_iteration:
+                on_iteration(self.stats)
+        self.test_cases = list(self.corpus)
+        return results
+
+
+def main_coverage_fuzzer():
+    fuzzer = CoverageGuidedFuzzer(advanced_example_function, seed=0)
+    results = fuzzer.fuzz(1000)
+    print(fuzzer.stats)
+    fuzzer.save_results(results, 'coverage_fuzz_results.json')
+
+
+if __name__ == "__main__":
+    main_coverage_fuzzer()
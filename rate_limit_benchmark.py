@@ -0,0 +1,70 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from limits.storage import MemoryStorage
+
+from api_security import SharedMemoryStorage
+
+# Per-call cost of a sliding-window acquire, in microseconds
+def time_acquire(storage, iterations=100000, keys=1000):
+    names = [f"key:{i}" for i in range(keys)]
+    start = time.perf_counter()
+    for i in range(iterations):
+        storage.acquire_sliding_window_entry(names[i % keys], 10 ** 9, 3600)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def _hammer(storage, key, limit, attempts, results):
+    if isinstance(storage, str):
+        storage = SharedMemoryStorage(storage)
+    results.put(sum(storage.acquire_sliding_window_entry(key, limit, 3600) for _ in range(attempts)))
+
+# Several processes race for one key; exactly `limit` acquisitions may succeed in total.
+# With inherited set, the workers are forked from a parent that already opened the storage (gunicorn --preload).
+def check_atomicity(uri, processes=4, limit=5000, attempts=2000, inherited=False):
+    storage = SharedMemoryStorage(uri)
+    storage.reset()
+    context = multiprocessing.get_context('fork' if inherited else None)
+    results = context.Queue()
+    target = storage if inherited else uri
+    workers = [context.Process(target=_hammer, args=(target, 'key:shared', limit, attempts, results))
+               for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    granted = sum(results.get() for _ in workers)
+    for worker in workers:
+        worker.join()
+    return granted, min(limit, processes * attempts)
+
+# Main function
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the shared-memory rate-limit storage")
+    parser.add_argument('--iterations', type=int, default=100000)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--max-us', type=float, default=6.0, help="fail if an acquire costs more than this")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as folder:
+        uri = f"shm://{os.path.join(folder, 'ratelimit')}"
+        shared_us = time_acquire(SharedMemoryStorage(uri), args.iterations)
+        memory_us = time_acquire(MemoryStorage(), args.iterations)
+        granted, expected = check_atomicity(uri, args.processes)
+        inherited_granted, _ = check_atomicity(uri, args.processes, inherited=True)
+
+    print(f"shm://    {shared_us:.2f} us per acquire")
+    print(f"memory:// {memory_us:.2f} us per acquire (per-process only)")
+    print(f"{args.processes} processes racing for one key: {granted} granted, {expected} allowed")
+    print(f"{args.processes} forked processes sharing one storage: {inherited_granted} granted, {expected} allowed")
+    failed = False
+    if granted != expected or inherited_granted != expected:
+        print("FAIL counts were lost or overshot")
+        failed = True
+    if shared_us > args.max_us:
+        print(f"FAIL acquire cost {shared_us:.2f} us exceeds {args.max_us:.2f} us")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
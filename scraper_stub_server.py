@@ -0,0 +1,112 @@
+import argparse
+import asyncio
+import hashlib
+import sys
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from automation_scripts import AsyncScraper, scrape_data
+
+LAST_MODIFIED = formatdate(time.time(), usegmt=True)
+
+# Page body for a path: a few item blocks among filler markup
+def render_page(path, items=20, filler=200):
+    blocks = [f'<div class="item"><h2>{path} item {i}</h2><a href="{path}/{i}">more</a></div>' for i in range(items)]
+    padding = ''.join(f'<p class="filler">paragraph {i}</p>' for i in range(filler))
+    return f'<html><body>{padding}{"".join(blocks)}{padding}</body></html>'.encode()
+
+# Local stand-in for the monitored sites: ETag/Last-Modified validators, latency and injected failures
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    latency = 0.0
+    fail_every = 0
+    requests = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with StubHandler.lock:
+            StubHandler.requests += 1
+            count = StubHandler.requests
+        time.sleep(self.latency)
+        if self.fail_every and count % self.fail_every == 0:
+            self._send(503, b'unavailable', {'Retry-After': '0'})
+            return
+        body = render_page(self.path)
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag or self.headers.get('If-Modified-Since') == LAST_MODIFIED:
+            self._send(304, b'', {'ETag': etag})
+            return
+        self._send(200, body, {'ETag': etag, 'Last-Modified': LAST_MODIFIED, 'Content-Type': 'text/html'})
+
+    def _send(self, status, body, headers):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+# Start the stub on a free local port in a background thread
+def start_stub_server(latency=0.0, fail_every=0):
+    StubHandler.latency = latency
+    StubHandler.fail_every = fail_every
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+# Compare the blocking scraper with the async engine, cold and with every page unchanged
+def run_comparison(pages=200, latency=0.02, fail_every=0):
+    server, base = start_stub_server(latency, fail_every)
+    urls = [f"{base}/page/{i}" for i in range(pages)]
+    try:
+        start = time.perf_counter()
+        blocking = [scrape_data(url) for url in urls]
+        blocking_seconds = time.perf_counter() - start
+
+        async def cycles():
+            async with AsyncScraper(retries=5, backoff=0.01) as scraper:
+                first_start = time.perf_counter()
+                first = await scraper.scrape_all(urls)
+                first_seconds = time.perf_counter() - first_start
+                second_start = time.perf_counter()
+                second = await scraper.scrape_all(urls)
+                return first, first_seconds, second, time.perf_counter() - second_start, scraper.stats
+
+        first, first_seconds, second, second_seconds, stats = asyncio.run(cycles())
+    finally:
+        server.shutdown()
+
+    expected = [row for data in blocking for row in data]
+    return {
+        'blocking_pages_per_sec': pages / blocking_seconds,
+        'async_pages_per_sec': pages / first_seconds,
+        'async_unchanged_pages_per_sec': pages / second_seconds,
+        'matches_blocking': fail_every > 0 or [row for url in urls for row in first[url]] == expected,
+        'unchanged_matches': second == first,
+        'stats': stats,
+    }
+
+# Main function
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the scrapers against a local stub HTTP server")
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.02, help="server delay per request in seconds")
+    parser.add_argument('--fail-every', type=int, default=0, help="answer every Nth request with 503")
+    args = parser.parse_args(argv)
+
+    report = run_comparison(args.pages, args.latency, args.fail_every)
+    print(f"blocking requests:   {report['blocking_pages_per_sec']:>8.1f} pages/s")
+    print(f"async cold:          {report['async_pages_per_sec']:>8.1f} pages/s")
+    print(f"async unchanged:     {report['async_unchanged_pages_per_sec']:>8.1f} pages/s (304 Not Modified)")
+    print(f"results match: {report['matches_blocking']}, unchanged cycle matches: {report['unchanged_matches']}")
+    print(f"engine stats: {report['stats']}")
+    return 0 if report['matches_blocking'] and report['unchanged_matches'] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Libraries that must not load as a side effect of importing the module
+HEAVY_MODULES = ['sklearn', 'scipy', 'matplotlib', 'seaborn', 'joblib']
+
+PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'import_seconds': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+'''
+
+# Import the module once in a fresh interpreter; returns import time, total process time and heavy modules loaded
+def measure_cold_import(module):
+    code = PROBE.format(module=module, heavy=HEAVY_MODULES)
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    result = json.loads(output.splitlines()[-1])
+    result['process_seconds'] = time.perf_counter() - start
+    return result
+
+# Median over several cold starts
+def benchmark_import(module, runs=5):
+    samples = [measure_cold_import(module) for _ in range(runs)]
+    return {
+        'module': module,
+        'runs': runs,
+        'import_seconds': statistics.median(sample['import_seconds'] for sample in samples),
+        'process_seconds': statistics.median(sample['process_seconds'] for sample in samples),
+        'loaded': sorted({module for sample in samples for module in sample['loaded']}),
+    }
+
+# Regressions against a saved baseline: any heavy import at all, or a slower median import
+def check_regressions(result, baseline=None, tolerance=0.25):
+    regressions = [f"{result['module']} imports {module} at import time" for module in result['loaded']]
+    if baseline and result['import_seconds'] > baseline['import_seconds'] * (1 + tolerance):
+        regressions.append(f"{result['module']} import took {result['import_seconds'] * 1000:.0f} ms vs baseline "
+                           f"{baseline['import_seconds'] * 1000:.0f} ms")
+    return regressions
+
+# Main function
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark cold-start import time of ai_sports_analytics")
+    parser.add_argument('--module', default='ai_sports_analytics')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--baseline', help="results file to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument('--save-baseline', action='store_true', help="write the results to --baseline")
+    args = parser.parse_args(argv)
+
+    result = benchmark_import(args.module, args.runs)
+    print(f"{result['module']}: import {result['import_seconds'] * 1000:.1f} ms, "
+          f"process {result['process_seconds'] * 1000:.1f} ms (median of {result['runs']})")
+
+    if args.baseline and args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(result, f, indent=4)
+        return 0
+    baseline = None
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = check_regressions(result, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+import numpy as np
+import pandas as pd
+import joblib
+
+# Load a saved model once. Arrays the model holds directly (e.g. linear coefficients) are memory-mapped;
+# sklearn copies tree structures into ordinary memory when unpickling, so forests are not shared between processes
+def load_serving_model(filename, mmap=True):
+    return joblib.load(filename, mmap_mode='r' if mmap else None)
+
+# Micro-batching front end for one model
+class BatchPredictor:
+    def __init__(self, model, max_batch_size=64, max_wait_ms=0.0, latency_window=10000):
+        self.model = model
+        self.feature_names = list(getattr(model, 'feature_names_in_', []))
+        self.known_features = set(self.feature_names)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.requests = queue.Queue()
+        self.latencies = deque(maxlen=latency_window)
+        self.batches = 0
+        self.predictions = 0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    # Accepts a mapping of feature name to value, or a sequence in training column order
+    def _to_vector(self, row):
+        if isinstance(row, dict):
+            missing = [name for name in self.feature_names if name not in row]
+            unknown = [name for name in row if name not in self.known_features]
+            if missing or unknown:
+                raise ValueError(f"Bad feature names: missing {missing}, unknown {unknown}")
+            return [row[name] for name in self.feature_names]
+        vector = list(row)
+        if self.feature_names and len(vector) != len(self.feature_names):
+            raise ValueError(f"Expected {len(self.feature_names)} features, got {len(vector)}")
+        return vector
+
+    def submit(self, row):
+        future = Future()
+        self.requests.put((self._to_vector(row), future, time.perf_counter()))
+        return future
+
+    def predict(self, row, timeout=None):
+        return self.submit(row).result(timeout)
+
+    # Callers that already hold many rows skip the queue entirely
+    def predict_many(self, rows):
+        return self.model.predict(self._frame([self._to_vector(row) for row in rows]))
+
+    def _frame(self, vectors):
+        X = np.asarray(vectors, dtype=np.float64)
+        if self.feature_names:
+            return pd.DataFrame(X, columns=self.feature_names, copy=False)
+        return X
+
+    def _collect(self, first):
+        batch = [first]
+        # Take whatever is already queued; optionally wait a little longer for stragglers
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                remaining = deadline - time.perf_counter()
+                item = self.requests.get(timeout=remaining) if remaining > 0 else self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self.requests.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self.requests.get()
+            if first is None:
+                return
+            # Futures the caller already cancelled are dropped; the rest can no longer be cancelled
+            batch = [item for item in self._collect(first) if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                self._predict_batch(batch)
+            except Exception as e:
+                # One bad batch fails its own callers only; the batcher keeps serving
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _predict_batch(self, batch):
+        predictions = self.model.predict(self._frame([vector for vector, _, _ in batch]))
+        done = time.perf_counter()
+        for (_, future, started), prediction in zip(batch, predictions):
+            future.set_result(prediction)
+            self.latencies.append(done - started)
+        self.batches += 1
+        self.predictions += len(batch)
+
+    def metrics(self):
+        latencies = np.array(self.latencies)
+        if not len(latencies):
+            return {'predictions': 0, 'batches': 0}
+        return {
+            'predictions': self.predictions,
+            'batches': self.batches,
+            'mean_batch_size': self.predictions / max(self.batches, 1),
+            'p50_ms': float(np.percentile(latencies, 50) * 1000),
+            'p99_ms': float(np.percentile(latencies, 99) * 1000),
+        }
+
+    def close(self):
+        self.requests.put(None)
+        self.thread.join()
+
+# Serves several saved models by name
+class ModelServer:
+    def __init__(self, model_files, max_batch_size=64, max_wait_ms=0.0, mmap=True):
+        self.predictors = {
+            name: BatchPredictor(load_serving_model(filename, mmap), max_batch_size, max_wait_ms)
+            for name, filename in model_files.items()
+        }
+
+    def predict(self, name, row, timeout=None):
+        return self.predictors[name].predict(row, timeout)
+
+    def submit(self, name, row):
+        return self.predictors[name].submit(row)
+
+    def predict_many(self, name, rows):
+        return self.predictors[name].predict_many(rows)
+
+    def metrics(self):
+        return {name: predictor.metrics() for name, predictor in self.predictors.items()}
+
+    def close(self):
+        for predictor in self.predictors.values():
+            predictor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+# Example usage with the models written by ai_sports_analytics.main()
+if __name__ == "__main__":
+    with ModelServer({'linear': 'linear_regression_model.pkl', 'forest': 'random_forest_model.pkl'}) as server:
+        n_features = len(server.predictors['forest'].feature_names)
+        rows = np.random.rand(1000, n_features)
+        futures = [server.submit('forest', row) for row in rows]
+        predictions = [future.result() for future in futures]
+        print(f"Served {len(predictions)} predictions")
+        print(server.metrics())